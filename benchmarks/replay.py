@@ -0,0 +1,237 @@
+"""Replay synthetic MESSAGE_CREATE payloads through Pride without Discord.
+
+A stub HTTP server stands in for Discord's REST API, the gateway is skipped
+by handing payloads straight to the connection state's parsers, and
+Postgres and Redis are replaced with in-memory stand-ins unless real ones
+are given. Every message goes to its own channel from its own author so the
+cooldowns in ``Pride.on_message`` do not drop it. Latency is measured from
+the moment a payload is parsed until the stub receives the first message
+sent to that channel.
+
+    python -m benchmarks.replay --messages 2000 --commands "help" "help kick" "warnings"
+"""
+
+import argparse, asyncio, datetime, itertools, json, os, sys, time
+from typing import Dict, List
+
+import discord
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import Pride
+
+GUILD_ID = 900000000000000000
+BOT_ID = 900000000000000001
+OWNER_ID = 900000000000000002
+NOW = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+snowflakes = itertools.count(910000000000000000)
+
+def user(user_id: int, bot: bool = False) -> dict:
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None, "bot": bot}
+
+def message(message_id: int, channel_id: int, author: dict, content: str) -> dict:
+    return {
+        "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(GUILD_ID), "author": author,
+        "member": {"roles": [], "joined_at": NOW, "deaf": False, "mute": False, "flags": 0},
+        "content": content, "timestamp": NOW, "edited_timestamp": None, "tts": False, "mention_everyone": False,
+        "mentions": [], "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0,
+    }
+
+def guild(channels: List[int]) -> dict:
+    return {
+        "id": str(GUILD_ID), "name": "replay", "owner_id": str(OWNER_ID), "large": False, "member_count": 2, "unavailable": False,
+        # administrator for @everyone so permission checks pass for every synthetic author
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "8", "position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False, "flags": 0}],
+        "channels": [{"id": str(channel_id), "type": 0, "name": f"replay-{i}", "position": i, "permission_overwrites": [], "nsfw": False} for i, channel_id in enumerate(channels)],
+        "members": [{"user": user(BOT_ID, bot=True), "roles": [], "joined_at": NOW, "deaf": False, "mute": False, "flags": 0}],
+        "emojis": [], "stickers": [], "features": [], "threads": [], "voice_states": [], "presences": [], "stage_instances": [], "guild_scheduled_events": [],
+    }
+
+class MemoryPool:
+    """Stands in for ``asyncpg.Pool``: every read finds nothing, every write succeeds.
+
+    ``latency`` adds a simulated round trip to each call.
+    """
+
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.queries = 0
+
+    async def roundtrip(self) -> None:
+        self.queries += 1
+        if self.latency: await asyncio.sleep(self.latency)
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        await self.roundtrip()
+        return "OK"
+
+    async def executemany(self, query: str, args, **kwargs) -> None:
+        await self.roundtrip()
+
+    async def fetch(self, query: str, *args, **kwargs) -> list:
+        await self.roundtrip()
+        return []
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> None:
+        await self.roundtrip()
+        return None
+
+    async def fetchval(self, query: str, *args, **kwargs) -> None:
+        await self.roundtrip()
+        return None
+
+    async def copy_records_to_table(self, table: str, **kwargs) -> str:
+        await self.roundtrip()
+        return "COPY"
+
+    def acquire(self) -> "MemoryPool":
+        return self
+
+    def transaction(self) -> "MemoryPool":
+        return self
+
+    async def __aenter__(self) -> "MemoryPool":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+class MemoryRedis:
+    """The subset of ``bot.bot.Redis`` the bot uses, backed by a dict."""
+
+    def __init__(self):
+        self.data: Dict[str, object] = {}
+
+    async def get(self, key: str):
+        return self.data.get(key)
+
+    async def set(self, key: str, value, **kwargs):
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys: str):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def keys(self, pattern: str = "*"):
+        return list(self.data)
+
+    async def ladd(self, key: str, *values, **kwargs):
+        self.data.setdefault(key, set()).update(values)
+        return len(values)
+
+    async def lget(self, key: str):
+        return list(self.data.get(key, ()))
+
+    async def close(self):
+        pass
+
+def json_response(data) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly application/json
+    return web.Response(body=json.dumps(data).encode(), headers={"Content-Type": "application/json"})
+
+class StubDiscord:
+    """Answers the REST routes the bot hits and timestamps replies per channel."""
+
+    def __init__(self):
+        self.replies: Dict[int, float] = {}
+        self.requests = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        path = request.match_info["path"]
+
+        if path == "users/@me":
+            return json_response(user(BOT_ID, bot=True))
+        if path == "oauth2/applications/@me":
+            return json_response({"id": str(BOT_ID), "name": "replay", "icon": None, "description": "", "bot_public": True, "bot_require_code_grant": False, "owner": user(OWNER_ID), "verify_key": "", "flags": 0, "team": None})
+
+        parts = path.split("/")
+        if request.method == "POST" and len(parts) == 3 and parts[0] == "channels" and parts[2] == "messages":
+            channel_id = int(parts[1])
+            self.replies.setdefault(channel_id, time.perf_counter())
+            return json_response(message(next(snowflakes), channel_id, user(BOT_ID, bot=True), ""))
+
+        if path.endswith("/webhooks"):
+            return json_response([])
+        return web.Response(status=204)
+
+    async def start(self) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_route("*", "/api/v10/{path:.*}", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return runner
+
+class ReplayBot(Pride):
+    def __init__(self, db_latency: float = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.db_latency = db_latency
+
+    async def create_db_pool(self):
+        if os.environ.get("DATABASE_URL"): return await super().create_db_pool()
+        self.db = MemoryPool(self.db_latency)
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values: return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+async def replay(contents: List[str], messages: int, rate: float, timeout: float, db_latency: float) -> None:
+    stub = StubDiscord()
+    runner = await stub.start()
+    discord.http.Route.BASE = f"http://127.0.0.1:{stub.port}/api/v10"
+
+    bot = ReplayBot(db_latency=db_latency)
+    await bot.login("replay")
+    if not os.environ.get("REDIS_URL"): bot.redis = MemoryRedis()
+
+    channels = [next(snowflakes) for _ in range(messages)]
+    bot._connection.parse_guild_create(guild(channels))
+
+    sent: Dict[int, tuple] = {}
+    start = time.perf_counter()
+    for i, channel_id in enumerate(channels):
+        content = ";" + contents[i % len(contents)]
+        author = user(next(snowflakes))
+        sent[channel_id] = (content, time.perf_counter())
+        bot._connection.parse_message_create(message(next(snowflakes), channel_id, author, content))
+        await asyncio.sleep(1 / rate if rate else 0)
+
+    deadline = time.perf_counter() + timeout
+    while len(stub.replies) < len(sent) and time.perf_counter() < deadline: await asyncio.sleep(0.05)
+    elapsed = max(stub.replies.values(), default=time.perf_counter()) - start
+
+    results: Dict[str, List[float]] = {content: [] for content in contents}
+    for channel_id, (content, sent_at) in sent.items():
+        if channel_id in stub.replies: results[content[1:]].append((stub.replies[channel_id] - sent_at) * 1000)
+
+    print(f"{len(sent)} messages in {elapsed:.2f}s ({len(stub.replies) / elapsed:.0f} replies/s), {stub.requests} REST calls, {getattr(bot.db, 'queries', '?')} queries")
+    print(f"{'command':<24}{'sent':>7}{'replied':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    rows = [(content, sum(1 for c, _ in sent.values() if c[1:] == content), latencies) for content, latencies in results.items()]
+    rows.append(("all", len(sent), [latency for latencies in results.values() for latency in latencies]))
+    for content, count, latencies in rows:
+        print(f"{content:<24}{count:>7}{len(latencies):>9}{percentile(latencies, 50):>9.2f}{percentile(latencies, 90):>9.2f}{percentile(latencies, 99):>9.2f}{max(latencies, default=float('nan')):>9.2f}")
+
+    await bot.close()
+    await runner.cleanup()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--messages", type=int, default=1000, help="messages to replay")
+    parser.add_argument("--commands", nargs="+", default=["help", "help kick", "warnings"], help="message contents without the prefix, used round robin")
+    parser.add_argument("--rate", type=float, default=0, help="messages per second, 0 for as fast as possible")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for outstanding replies")
+    parser.add_argument("--db-latency", type=float, default=0, help="simulated database round trip in milliseconds")
+    args = parser.parse_args()
+    asyncio.run(replay(args.commands, args.messages, args.rate, args.timeout, args.db_latency / 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare compiled welcome templates against re-parsing the template on every join.
+
+Every guild gets an embed welcome template with a handful of variables,
+members join spread over the guilds and each join renders its guild's
+template, either through the template cache or by parsing it again.
+
+    python -m benchmarks.templates --guilds 50 --messages 10000
+"""
+
+import argparse, os, random, sys, time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.templates import Template, Templates
+
+WELCOME = (
+    "{embed}$v{content: {user.mention}}$v{title: welcome to {guild.name}}"
+    "$v{description: hey {user.display_name}, you are our {guild.count.format} member}"
+    "$v{author: {user} && {user.avatar}}$v{thumbnail: {guild.icon}}"
+    "$v{field: account created && {user.created_at} && inline}$v{field: member id && {user.id} && inline}"
+    "$v{footer: {guild.name} has {guild.boost_count} boosts}$v{color: #%06x}"
+)
+
+def make_guild(guild_id: int, rng: random.Random) -> SimpleNamespace:
+    return SimpleNamespace(id=guild_id, name=f"guild {guild_id}", member_count=rng.randint(10, 100000), icon=None, premium_subscription_count=rng.randint(0, 30), premium_subscribers=[])
+
+class Member(SimpleNamespace):
+    def __str__(self) -> str:
+        return self.name
+
+def make_member(member_id: int, guild: SimpleNamespace) -> Member:
+    name = f"member{member_id}"
+    return Member(
+        id=member_id, name=name, display_name=name, mention=f"<@{member_id}>", guild=guild,
+        display_avatar=SimpleNamespace(url=f"https://cdn.discordapp.com/embed/avatars/{member_id % 5}.png"),
+        created_at=datetime.now(timezone.utc), joined_at=datetime.now(timezone.utc)
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--guilds", type=int, default=50, help="guilds to spread joins over")
+    parser.add_argument("--messages", type=int, default=10000, help="welcome messages to render")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    guilds = [make_guild(guild_id, rng) for guild_id in range(args.guilds)]
+    sources = {guild.id: WELCOME % rng.randrange(0x1000000) for guild in guilds}
+    joins = [make_member(member_id, rng.choice(guilds)) for member_id in range(args.messages)]
+    templates = Templates(SimpleNamespace())
+
+    for member in joins[:100]:
+        parsed = Template(sources[member.guild.id]).render(member)
+        cached = templates.render(member, sources[member.guild.id])
+        assert parsed["content"] == cached["content"] and parsed["embed"].to_dict() == cached["embed"].to_dict()
+
+    start = time.perf_counter()
+    for member in joins: Template(sources[member.guild.id]).render(member)
+    parsed_rate = len(joins) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for member in joins: templates.render(member, sources[member.guild.id])
+    cached_rate = len(joins) / (time.perf_counter() - start)
+
+    print(f"{'renderer':<12}{'messages/s':>14}{'us/message':>14}")
+    print(f"{'parsed':<12}{parsed_rate:>14.0f}{1e6 / parsed_rate:>14.1f}")
+    print(f"{'compiled':<12}{cached_rate:>14.0f}{1e6 / cached_rate:>14.1f}")
+    print(f"{cached_rate / parsed_rate:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare the compiled trigger engine against naive per-pattern matching.
+
+Every guild gets ``--triggers`` patterns split between the chat filter,
+autoreacts and autoresponses, plus the invite filter. Messages are random
+words with a trigger or an invite mixed into a fraction of them.
+
+    python -m benchmarks.triggers --guilds 10 --triggers 1000 --messages 50000
+"""
+
+import argparse, os, random, string, sys, time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.guildconfig import GuildConfig
+from bot.triggers import INVITE, GuildTriggers, wordchar
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+
+def make_config(guild_id: int, triggers: int, rng: random.Random) -> GuildConfig:
+    patterns = [word(rng) + word(rng) for _ in range(triggers)]
+    third = triggers // 3
+    return GuildConfig(guild_id, {
+        "chatfilter": [{"word": pattern} for pattern in patterns[:third]],
+        "autoreact": [{"trigger": pattern, "emojis": "🔥"} for pattern in patterns[third:2 * third]],
+        "autoresponses": [{"key": pattern, "response": "hi"} for pattern in patterns[2 * third:]],
+        "antiinvite": [{"guild_id": guild_id}],
+    })
+
+def patterns(config: GuildConfig) -> List[str]:
+    return [row["word"] for row in config.chatfilter] + [row["trigger"] for row in config.autoreact] + [row["key"] for row in config.autoresponses]
+
+def whole(pattern: str, content: str) -> bool:
+    """Whether ``pattern`` occurs in ``content`` on word boundaries, checked occurrence by occurrence."""
+    start = content.find(pattern)
+    while start != -1:
+        end = start + len(pattern)
+        if (start == 0 or not wordchar(pattern[0]) or not wordchar(content[start - 1])) and (end == len(content) or not wordchar(pattern[-1]) or not wordchar(content[end])): return True
+        start = content.find(pattern, start + 1)
+    return False
+
+def naive(config: GuildConfig, content: str) -> int:
+    content = content.casefold()
+    found = sum(whole(row["word"], content) for row in config.chatfilter)
+    found += sum(whole(row["trigger"], content) for row in config.autoreact)
+    found += sum(whole(row["key"], content) for row in config.autoresponses)
+    return found + (INVITE.search(content) is not None)
+
+def compiled(triggers: GuildTriggers, content: str) -> int:
+    matches = triggers.match(content)
+    return len(matches.filtered) + len(matches.reactions) + len(matches.responses) + matches.invite
+
+def messages(configs: List[GuildConfig], count: int, hit_rate: float, rng: random.Random) -> List[tuple]:
+    result = []
+    for _ in range(count):
+        config = rng.choice(configs)
+        words = [word(rng) for _ in range(rng.randint(3, 30))]
+        if rng.random() < hit_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(patterns(config) + ["discord.gg/replay"]))
+        result.append((config, " ".join(word for word in words if word)))
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--guilds", type=int, default=10, help="guilds to spread messages over")
+    parser.add_argument("--triggers", type=int, default=1000, help="triggers per guild")
+    parser.add_argument("--messages", type=int, default=50000, help="messages to match")
+    parser.add_argument("--hit-rate", type=float, default=0.1, help="fraction of messages containing a trigger")
+    parser.add_argument("--naive-messages", type=int, default=2000, help="messages to time the naive matcher on, it is much slower")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    configs = [make_config(guild_id, args.triggers, rng) for guild_id in range(args.guilds)]
+
+    start = time.perf_counter()
+    triggers = {config.guild_id: GuildTriggers(config) for config in configs}
+    build = (time.perf_counter() - start) / len(configs)
+    states = sum(len(t.automaton.goto) for t in triggers.values()) / len(configs)
+    print(f"{args.triggers} triggers per guild: {build * 1000:.1f}ms to compile a guild, {states:.0f} states")
+
+    sample = messages(configs, args.messages, args.hit_rate, rng)
+    for config, content in sample[:args.naive_messages]:
+        assert compiled(triggers[config.guild_id], content) == naive(config, content), content
+
+    start = time.perf_counter()
+    for config, content in sample[:args.naive_messages]: naive(config, content)
+    naive_rate = min(args.naive_messages, len(sample)) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for config, content in sample: compiled(triggers[config.guild_id], content)
+    compiled_rate = len(sample) / (time.perf_counter() - start)
+
+    print(f"{'matcher':<12}{'messages/s':>14}{'us/message':>14}")
+    print(f"{'naive':<12}{naive_rate:>14.0f}{1e6 / naive_rate:>14.1f}")
+    print(f"{'compiled':<12}{compiled_rate:>14.0f}{1e6 / compiled_rate:>14.1f}")
+    print(f"{compiled_rate / naive_rate:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import asyncio, time
+from typing import Dict, Optional, Set, Tuple
+
+import discord
+from discord.ext import commands
+
+from bot.antispam import Tracker
+from bot.guildconfig import GuildConfig
+
+# audit log action -> antinuke module it counts towards
+MODULES: Dict[discord.AuditLogAction, str] = {
+    discord.AuditLogAction.ban: "ban",
+    discord.AuditLogAction.kick: "kick",
+    discord.AuditLogAction.member_prune: "kick",
+    discord.AuditLogAction.channel_create: "channelcreate",
+    discord.AuditLogAction.channel_delete: "channeldelete",
+    discord.AuditLogAction.channel_update: "channelupdate",
+    discord.AuditLogAction.role_create: "rolecreate",
+    discord.AuditLogAction.role_delete: "roledelete",
+    discord.AuditLogAction.role_update: "roleupdate",
+    discord.AuditLogAction.webhook_create: "webhook",
+    discord.AuditLogAction.emoji_delete: "emojidelete",
+    discord.AuditLogAction.bot_add: "botadd",
+    discord.AuditLogAction.guild_update: "guildupdate",
+}
+
+OUTCOMES = {"ban": "banned", "kick": "kicked", "strip": "stripped"}
+
+class Rules:
+    """A guild's antinuke settings, indexed so each audit log entry is checked in O(1)."""
+
+    def __init__(self, config: GuildConfig):
+        self.config = config
+        toggle = config.first("antinuke_toggle")
+        self.enabled = toggle is not None
+        self.logs: Optional[int] = toggle["logs"] if toggle else None
+        self.modules: Dict[str, Tuple[str, int]] = {row["module"]: (row["punishment"] or "ban", max(row["threshold"] or 1, 1)) for row in config.antinuke if row["module"]}
+        self.trusted: Set[int] = {row["user_id"] for row in config.antinuke_whitelist + config.antinuke_admins}
+
+class Antinuke:
+    """Counts destructive audit log actions per actor and punishes whoever crosses a module's threshold.
+
+    Each (guild, actor, module) has a ``Tracker`` of its last ``threshold``
+    actions, so the entry that makes it ``threshold`` actions within
+    ``window`` seconds triggers the punishment straight away. Trackers idle
+    for longer than the window are dropped every ``sweep`` seconds. The guild
+    owner, the bot, and users in ``antinuke_whitelist`` or
+    ``antinuke_admins`` are never counted.
+    """
+
+    def __init__(self, bot: commands.Bot, window: float = 60.0, sweep: float = 300.0):
+        self.bot = bot
+        self.window = window
+        self.sweep = sweep
+        self.task: Optional[asyncio.Task] = None
+        self.rules: Dict[int, Rules] = {}
+        self.trackers: Dict[Tuple[int, int, str], Tracker] = {}
+        self.punishing: Set[Tuple[int, int]] = set()
+
+    async def get_rules(self, guild_id: int) -> Rules:
+        config = await self.bot.guild_config.get(guild_id)
+        rules = self.rules.get(guild_id)
+        if rules is None or rules.config is not config:
+            rules = self.rules[guild_id] = Rules(config)
+        return rules
+
+    async def handle(self, entry: discord.AuditLogEntry) -> None:
+        module = MODULES.get(entry.action)
+        guild = entry.guild
+        if module is None or entry.user_id is None or entry.user_id in (guild.owner_id, self.bot.user.id): return
+
+        rules = await self.get_rules(guild.id)
+        rule = rules.modules.get(module)
+        if not rules.enabled or rule is None or entry.user_id in rules.trusted: return
+
+        punishment, threshold = rule
+        key = (guild.id, entry.user_id, module)
+        tracker = self.trackers.get(key)
+        if tracker is None or len(tracker.times) != threshold:
+            tracker = self.trackers[key] = Tracker(threshold)
+        if not tracker.hit(time.monotonic(), self.window): return
+
+        del self.trackers[key]
+        if (guild.id, entry.user_id) in self.punishing: return
+        self.punishing.add((guild.id, entry.user_id))
+        try:
+            await self.punish(guild, entry, module, punishment, rules)
+        finally:
+            self.punishing.discard((guild.id, entry.user_id))
+
+    async def punish(self, guild: discord.Guild, entry: discord.AuditLogEntry, module: str, punishment: str, rules: Rules) -> None:
+        reason = f"Antinuke: {module} threshold reached"
+        actor = guild.get_member(entry.user_id) or discord.Object(entry.user_id)
+        try:
+            if punishment == "kick": await guild.kick(actor, reason=reason)
+            elif punishment == "strip":
+                # a strip never falls back to a ban, an actor missing from the cache is fetched and failing that is reported
+                if not isinstance(actor, discord.Member): actor = await guild.fetch_member(entry.user_id)
+                # roles the bot cannot manage (managed or above it) have to stay in the list
+                await actor.edit(roles=[role for role in actor.roles[1:] if not role.is_assignable() or not self.bot.ext.is_dangerous(role)], reason=reason)
+            else: await guild.ban(actor, reason=reason, delete_message_seconds=0)
+            outcome = f"**{OUTCOMES.get(punishment, 'banned')}**"
+        except discord.HTTPException as e:
+            outcome = f"could not be punished ({e.text or e.status})"
+        except Exception as e:
+            outcome = f"could not be punished ({e})"
+
+        # a bot added by the actor goes with them
+        if entry.action == discord.AuditLogAction.bot_add and entry.target:
+            try: await guild.ban(entry.target, reason=reason, delete_message_seconds=0)
+            except Exception as e: outcome += f", the bot they added could not be banned ({e})"
+
+        channel = guild.get_channel(rules.logs) if rules.logs else None
+        if channel:
+            embed = discord.Embed(color=self.bot.color, title="Antinuke", description=f"<@{entry.user_id}> {outcome} for reaching the **{module}** threshold")
+            embed.add_field(name="action", value=entry.action.name)
+            embed.add_field(name="target", value=str(entry.target) if entry.target else "none")
+            try: await channel.send(embed=embed)
+            except discord.HTTPException: pass
+
+    def drop(self, guild_id: int) -> None:
+        self.rules.pop(guild_id, None)
+        for key in [key for key in self.trackers if key[0] == guild_id]: del self.trackers[key]
+
+    def evict(self) -> None:
+        cutoff = time.monotonic() - self.window
+        for key in [key for key, tracker in self.trackers.items() if tracker.last < cutoff]: del self.trackers[key]
+
+    async def evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep)
+            self.evict()
+
+    def start(self) -> None:
+        if self.task is None: self.task = asyncio.create_task(self.evict_loop())
+
+    def stop(self) -> None:
+        if self.task: self.task.cancel()
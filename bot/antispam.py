@@ -0,0 +1,122 @@
+import asyncio, datetime, time
+from array import array
+from typing import Dict, Optional, Set, Tuple
+
+import discord
+from discord.ext import commands
+
+class Tracker:
+    """Ring buffer of a member's last ``count`` message times.
+
+    After a message is recorded the slot under ``cursor`` holds the oldest of
+    the last ``count`` times, so the member has sent ``count`` messages within
+    the window exactly when that slot is inside it.
+    """
+
+    __slots__ = ("times", "cursor")
+
+    def __init__(self, count: int):
+        self.times = array("d", bytes(8 * count))
+        self.cursor = 0
+
+    def hit(self, now: float, seconds: float) -> bool:
+        times = self.times
+        times[self.cursor] = now
+        self.cursor = (self.cursor + 1) % len(times)
+        return times[self.cursor] > now - seconds
+
+    @property
+    def last(self) -> float:
+        return self.times[self.cursor - 1]
+
+class Antispam:
+    """Enforces the ``antispam`` table: ``count`` messages in ``seconds`` triggers ``punishment``.
+
+    Members that trip the limit are queued per guild and punished together
+    after ``delay`` seconds, so a raid of spammers costs one ``bulk_ban``
+    instead of a request each. Trackers idle for longer than their window
+    are dropped every ``sweep`` seconds.
+    """
+
+    def __init__(self, bot: commands.Bot, delay: float = 1.0, sweep: float = 60.0, timeout: datetime.timedelta = datetime.timedelta(minutes=5)):
+        self.bot = bot
+        self.delay = delay
+        self.sweep = sweep
+        self.timeout = timeout
+        self.trackers: Dict[int, Dict[int, Tracker]] = {}
+        self.windows: Dict[int, float] = {}
+        self.pending: Dict[int, Tuple[str, Set[discord.Member]]] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    async def check(self, message: discord.Message) -> bool:
+        """Records the message and returns whether its author tripped the limit."""
+        if not message.guild or message.author.bot or not isinstance(message.author, discord.Member): return False
+
+        config = self.bot.guild_config.get_cached(message.guild.id) or await self.bot.guild_config.get(message.guild.id)
+        settings = config.first("antispam")
+        if not settings or not settings["count"] or not settings["seconds"]:
+            self.trackers.pop(message.guild.id, None)
+            return False
+        if message.author.guild_permissions.manage_messages or any(row["object_id"] in (message.author.id, message.channel.id) for row in config.whitelist if row["module"] == "antispam"): return False
+
+        guild = self.trackers.setdefault(message.guild.id, {})
+        tracker = guild.get(message.author.id)
+        if tracker is None or len(tracker.times) != settings["count"]:
+            tracker = guild[message.author.id] = Tracker(settings["count"])
+        self.windows[message.guild.id] = settings["seconds"]
+
+        if not tracker.hit(time.monotonic(), settings["seconds"]): return False
+        self.punish(message.author, settings["punishment"] or "timeout")
+        return True
+
+    def punish(self, member: discord.Member, punishment: str) -> None:
+        batch = self.pending.get(member.guild.id)
+        if batch is None:
+            batch = self.pending[member.guild.id] = (punishment, set())
+            asyncio.get_running_loop().call_later(self.delay, lambda: asyncio.ensure_future(self.flush(member.guild)))
+        batch[1].add(member)
+
+    async def flush(self, guild: discord.Guild) -> None:
+        punishment, members = self.pending.pop(guild.id, ("", set()))
+        members = [member for member in members if guild.get_member(member.id)]
+        if not members: return
+
+        reason = "Antispam: exceeded the message limit"
+        try:
+            if punishment == "ban":
+                for i in range(0, len(members), 200): await guild.bulk_ban(members[i:i+200], reason=reason, delete_message_seconds=3600)
+            elif punishment == "kick":
+                await asyncio.gather(*(member.kick(reason=reason) for member in members), return_exceptions=True)
+            else:
+                until = discord.utils.utcnow() + self.timeout
+                await asyncio.gather(*(member.timeout(until, reason=reason) for member in members), return_exceptions=True)
+        except discord.HTTPException as e:
+            print(f"Antispam failed to {punishment} {len(members)} members in {guild.id}: {e}")
+
+        trackers = self.trackers.get(guild.id, {})
+        for member in members: trackers.pop(member.id, None)
+
+    def evict(self) -> None:
+        now = time.monotonic()
+        for guild_id, trackers in list(self.trackers.items()):
+            cutoff = now - self.windows.get(guild_id, 0)
+            for member_id in [member_id for member_id, tracker in trackers.items() if tracker.last < cutoff]: del trackers[member_id]
+            if not trackers:
+                del self.trackers[guild_id]
+                self.windows.pop(guild_id, None)
+
+    async def evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep)
+            self.evict()
+
+    def start(self) -> None:
+        if self.task is None: self.task = asyncio.create_task(self.evict_loop())
+
+    def stop(self) -> None:
+        if self.task: self.task.cancel()
+
+    def drop(self, guild_id: int) -> None:
+        self.trackers.pop(guild_id, None)
+        self.windows.pop(guild_id, None)
+        self.pending.pop(guild_id, None)
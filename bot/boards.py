@@ -0,0 +1,159 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import asyncpg
+import discord
+from discord.ext import commands
+
+# board table -> (table mapping messages to board posts, default emoji)
+BOARDS: Dict[str, Tuple[str, str]] = {
+    "starboard": ("starboardmes", "⭐"),
+    "skullboard": ("skullboardmes", "💀"),
+}
+
+class Tally:
+    __slots__ = ("guild_id", "channel_id", "count", "rendered", "post", "scheduled")
+
+    def __init__(self, guild_id: int, channel_id: int):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        # None until seeded from the message itself
+        self.count: Optional[int] = None
+        # None until this process has rendered the post, so an existing post is brought up to date once
+        self.rendered: Optional[int] = None
+        # (board channel id, board message id), False when known to have no post yet, None when not looked up
+        self.post = None
+        self.scheduled = False
+
+class Boards:
+    """Starboard and skullboard driven by raw reaction events.
+
+    Each event only adjusts an in-memory tally and marks the message dirty;
+    the board post is created or edited at most once per ``delay`` seconds
+    per message, with the latest count. A message is fetched once to seed
+    its tally and render the post, and the board post it maps to is looked
+    up once, both kept for the ``max_messages`` most recently active
+    messages. Every user's reactions count, other bots included, except the
+    bot's own, so adds, removes and the seeded count always agree.
+    """
+
+    def __init__(self, bot: commands.Bot, delay: float = 5.0, max_messages: int = 10_000):
+        self.bot = bot
+        self.delay = delay
+        self.max_messages = max_messages
+        self.tallies: "OrderedDict[Tuple[str, int], Tally]" = OrderedDict()
+
+    def matches(self, settings: dict, emoji: discord.PartialEmoji, default: str) -> bool:
+        if settings["emoji_id"]: return emoji.id == settings["emoji_id"]
+        return str(emoji) == (settings["emoji_text"] or default)
+
+    async def handle(self, payload: discord.RawReactionActionEvent, delta: int) -> None:
+        # the bot's own reactions never count, they are left out of the seeded count as well
+        if not payload.guild_id or payload.user_id == self.bot.user.id: return
+        config = await self.bot.guild_config.get(payload.guild_id)
+
+        for board, (_, default) in BOARDS.items():
+            settings = config.first(board)
+            if not settings or payload.channel_id == settings["channel_id"] or not self.matches(settings, payload.emoji, default): continue
+
+            tally = self.tally(board, payload)
+            if tally.count is not None: tally.count = max(tally.count + delta, 0)
+            self.schedule((board, payload.message_id), tally, settings)
+
+    async def clear(self, payload: discord.RawReactionClearEvent) -> None:
+        if not payload.guild_id: return
+        config = await self.bot.guild_config.get(payload.guild_id)
+
+        for board in BOARDS:
+            settings = config.first(board)
+            if not settings or payload.channel_id == settings["channel_id"]: continue
+            tally = self.tally(board, payload)
+            tally.count = 0
+            self.schedule((board, payload.message_id), tally, settings)
+
+    def tally(self, board: str, payload) -> Tally:
+        key = (board, payload.message_id)
+        tally = self.tallies.get(key)
+        if tally is None:
+            tally = self.tallies[key] = Tally(payload.guild_id, payload.channel_id)
+            while len(self.tallies) > self.max_messages: self.tallies.popitem(last=False)
+        else:
+            self.tallies.move_to_end(key)
+        return tally
+
+    def schedule(self, key: Tuple[str, int], tally: Tally, settings: dict) -> None:
+        if tally.scheduled: return
+        tally.scheduled = True
+        asyncio.get_running_loop().call_later(self.delay, lambda: asyncio.ensure_future(self.flush(key, tally, settings)))
+
+    async def post_for(self, board: str, message_id: int) -> Optional[Tuple[int, int]]:
+        row = await self.bot.db.fetchrow(f"SELECT channel_starboard_id, message_starboard_id FROM {BOARDS[board][0]} WHERE message_id = $1 LIMIT 1", message_id)
+        return (row["channel_starboard_id"], row["message_starboard_id"]) if row else None
+
+    def render(self, message: discord.Message, count: int, emoji: str) -> Tuple[str, discord.Embed]:
+        embed = discord.Embed(color=self.bot.color, description=message.content[:4096] or None, timestamp=message.created_at)
+        embed.set_author(name=str(message.author), icon_url=message.author.display_avatar.url)
+        image = next((attachment.url for attachment in message.attachments if attachment.content_type and attachment.content_type.startswith("image")), None)
+        if image: embed.set_image(url=image)
+        embed.add_field(name="source", value=f"[jump to message]({message.jump_url})")
+        return f"{emoji} **{count}** {message.channel.mention}", embed
+
+    async def flush(self, key: Tuple[str, int], tally: Tally, settings: dict) -> None:
+        tally.scheduled = False
+        board, message_id = key
+        emoji = settings["emoji_text"] or BOARDS[board][1]
+        if settings["emoji_id"]:
+            custom = self.bot.get_emoji(settings["emoji_id"])
+            emoji = str(custom) if custom else emoji
+
+        try:
+            message = None
+            if tally.count is None:
+                message = self.bot._connection._get_message(message_id) or await self.bot.ext.fetch_message(tally.guild_id, tally.channel_id, message_id)
+                if not message: return self.tallies.pop(key, None)
+                reaction = next((reaction for reaction in message.reactions if self.matches(settings, discord.PartialEmoji.from_str(str(reaction.emoji)), BOARDS[board][1])), None)
+                tally.count = reaction.count - reaction.me if reaction else 0
+
+            if tally.post is None: tally.post = await self.post_for(board, message_id) or False
+            if tally.count == tally.rendered: return
+
+            channel = self.bot.get_channel(settings["channel_id"])
+            if not channel: return
+
+            if tally.post and not tally.count:
+                # every reaction is gone, the post goes with them
+                await channel.get_partial_message(tally.post[1]).delete()
+                await self.bot.db.execute(f"DELETE FROM {BOARDS[board][0]} WHERE message_id = $1", message_id)
+                tally.post = False
+            elif tally.post:
+                await channel.get_partial_message(tally.post[1]).edit(content=f"{emoji} **{tally.count}** <#{tally.channel_id}>")
+            elif tally.count >= (settings["count"] or 1):
+                message = message or self.bot._connection._get_message(message_id) or await self.bot.ext.fetch_message(tally.guild_id, tally.channel_id, message_id)
+                if not message: return self.tallies.pop(key, None)
+                content, embed = self.render(message, tally.count, emoji)
+                post = await channel.send(content, embed=embed, allowed_mentions=discord.AllowedMentions.none())
+                tally.post = (channel.id, post.id)
+                tally.rendered = tally.count
+                try:
+                    await self.bot.db.execute(
+                        f"INSERT INTO {BOARDS[board][0]} (guild_id, channel_starboard_id, channel_message_id, message_starboard_id, message_id) VALUES ($1, $2, $3, $4, $5)",
+                        tally.guild_id, channel.id, tally.channel_id, post.id, message_id
+                    )
+                except (asyncpg.PostgresError, OSError) as e:
+                    # the post is still known while the tally is kept
+                    print(f"Failed to store {board} post for {message_id}: {e}")
+            else:
+                return
+            tally.rendered = tally.count
+        except discord.NotFound:
+            # the board post was deleted, it is sent again on the next reaction
+            tally.post = False
+            tally.rendered = None
+            try: await self.bot.db.execute(f"DELETE FROM {BOARDS[board][0]} WHERE message_id = $1", message_id)
+            except (asyncpg.PostgresError, OSError) as e: print(f"Failed to remove the {board} post of {message_id}: {e}")
+        except discord.HTTPException as e:
+            print(f"Failed to update {board} post for {message_id}: {e}")
+        except (asyncpg.PostgresError, OSError) as e:
+            print(f"Failed to update {board} post for {message_id}, retrying: {e}")
+            self.schedule(key, tally, settings)
@@ -1,4 +1,4 @@
-import discord, asyncpg, typing, time, os, discord_ios, pomice, asyncio, json
+import discord, asyncpg, typing, time, os, sys, discord_ios, pomice, asyncio, json
 
 from typing import List
 from humanfriendly import format_timespan
@@ -8,8 +8,26 @@ from discord.ext import commands
 from bot.helpers import StartUp
 from bot.helpers import PrideContext
 from bot.ext import Client
-from bot.database import create_db
+from bot.database import create_db, pool_options
+from bot.repositories import Repositories
+from bot.guildconfig import GuildConfigCache
+from bot.triggers import TriggerEngine
+from bot.antispam import Antispam
+from bot.antinuke import Antinuke
+from bot.snipe import SnipeStore
+from bot.levels import Levels
+from bot.leaderboards import Leaderboards
+from bot.seen import SeenTracker
+from bot.boards import Boards
+from bot.counters import Counters
+from bot.templates import Templates
+from bot.joins import Joins
+from bot.voicemaster import VoiceMaster
 from bot.headers import Session
+from bot.search import CommandIndex, RoleIndex
+from bot.errors import ErrorSink
+from bot import metrics, profiler
+from bot.profiler import ProfiledPool
 from bot.dynamicrolebutton import DynamicRoleButton
 
 from cogs.voicemaster import vmbuttons
@@ -85,6 +103,13 @@ class Redis(AsyncStrictRedis):
 
         return values
 
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            metrics.REDIS_LATENCY.observe(time.perf_counter() - start, str(args[0]))
+
     async def get_lock(self, key: str):
         return await self._lock()
 
@@ -112,6 +137,7 @@ class Pride(commands.AutoShardedBot):
                          help_command=None, strip_after_prefix=True, activity=discord.CustomActivity(name="🌈 Pride Bot"))
         
         self.db = db
+        self.repo = Repositories(self)
         
         self.color = 0xFFFFFF
         self.error_color= 0xFFFFFF
@@ -124,6 +150,23 @@ class Pride(commands.AutoShardedBot):
         self.pomice = pomice.NodePool()
         
         self.ext = Client(self)
+        self.command_index = CommandIndex(self)
+        self.role_index = RoleIndex()
+        self.errors = ErrorSink(self)
+        self.guild_config = GuildConfigCache(self)
+        self.triggers = TriggerEngine(self)
+        self.antispam = Antispam(self)
+        self.antinuke = Antinuke(self)
+        self.snipes = SnipeStore(self)
+        self.levels = Levels(self)
+        self.leaderboards = Leaderboards(self)
+        self.seen = SeenTracker(self)
+        self.boards = Boards(self)
+        self.counters = Counters(self)
+        self.templates = Templates(self)
+        self.joins = Joins(self)
+        self.voicemaster = VoiceMaster(self)
+        self.metrics_server = None
         
         self.m_cd=commands.CooldownMapping.from_cooldown(1,5,commands.BucketType.member)
         self.c_cd=commands.CooldownMapping.from_cooldown(1,5,commands.BucketType.channel)
@@ -145,7 +188,9 @@ class Pride(commands.AutoShardedBot):
         try:
             db_url = os.environ.get("DATABASE_URL")
             if db_url:
-                self.db = await asyncpg.create_pool(db_url)
+                self.db = await asyncpg.create_pool(db_url, init=self.init_connection, **pool_options())
+                if os.environ.get("DB_PROFILE"):
+                    self.db = ProfiledPool(self.db, slow=float(os.environ.get("DB_SLOW_QUERY_MS", 100)) / 1000)
                 print("Connected to database successfully!")
             else:
                 print("No DATABASE_URL found, database features will be disabled")
@@ -154,6 +199,9 @@ class Pride(commands.AutoShardedBot):
             print(f"Failed to connect to database: {e}")
             self.db = None
         
+  async def init_connection(self, connection: asyncpg.Connection) -> None:
+        connection.add_query_logger(lambda query: metrics.DB_LATENCY.observe(query.elapsed))
+        
   async def on_ready(self) -> None:
         print("I'm online!")
         print(f"Logged in as {self.user.name} (ID: {self.user.id})")
@@ -165,7 +213,11 @@ class Pride(commands.AutoShardedBot):
                 print(f"Failed to start music nodes: {e}")
         
   async def on_command_error(self, ctx: commands.Context, error: commands.CommandError):
-      if isinstance(error, commands.CommandNotFound): return 
+      if isinstance(error, commands.CommandNotFound): 
+        if not ctx.invoked_with: return
+        command = self.command_index.suggest(ctx.invoked_with)
+        if command: return await ctx.warning(f"Command `{ctx.invoked_with}` not found, did you mean `{command.qualified_name}`?")
+        return
       if isinstance(error, commands.NotOwner): pass
       if isinstance(error, commands.CheckFailure): 
         if isinstance(error, commands.MissingPermissions): return await ctx.warning(f"This command requires **{error.missing_permissions[0]}** permission")
@@ -182,7 +234,7 @@ class Pride(commands.AutoShardedBot):
       if isinstance(error, commands.MemberConverter): return await ctx.warning("Couldn't convert that into a **member**")
       if isinstance(error, commands.BadArgument): return await ctx.warning(error.args[0])
       if isinstance(error, commands.BotMissingPermissions): return await ctx.warning(f"I do not have enough **permissions** to execute this command")
-      if isinstance(error, commands.CommandInvokeError): return await ctx.warning(error.original)
+      if isinstance(error, commands.CommandInvokeError): return await ctx.warning(f"{error.original} (`{self.errors.report(error.original, ctx)}`)")
       if isinstance(error, discord.HTTPException): return await ctx.warning("Unable to execute this command")
       if isinstance(error, commands.NoPrivateMessage): return await ctx.warning(f"This command cannot be used in private messages.")
       if isinstance(error, commands.UserInputError): return await ctx.send_help(ctx.command.qualified_name)
@@ -191,6 +243,40 @@ class Pride(commands.AutoShardedBot):
       if isinstance(error, commands.GuildNotFound): return await ctx.warning(f"I was unable to find that **server** or the **ID** is invalid")
       if isinstance(error, commands.BadInviteArgument): return await ctx.warning(f"Invalid **invite code** given")
         
+  async def on_socket_event_type(self, event_type: str):
+      metrics.GATEWAY_EVENTS.inc(event_type)
+
+  async def invoke(self, ctx: commands.Context):
+      if ctx.command is None: return await super().invoke(ctx)
+      start = time.perf_counter()
+      token = profiler.command.set(ctx.command.qualified_name)
+      try: await super().invoke(ctx)
+      finally: profiler.command.reset(token)
+      metrics.COMMAND_LATENCY.observe(time.perf_counter() - start, ctx.command.qualified_name)
+      metrics.COMMANDS.inc(ctx.command.qualified_name, "failure" if ctx.command_failed else "success")
+
+  async def on_error(self, event_method: str, /, *args, **kwargs):
+      error = sys.exc_info()[1]
+      if error: self.errors.report(error, event=event_method)
+      await super().on_error(event_method, *args, **kwargs)
+
+  async def on_guild_role_create(self, role: discord.Role):
+      self.role_index.add(role)
+
+  async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+      self.role_index.update(before, after)
+
+  async def on_guild_role_delete(self, role: discord.Role):
+      self.role_index.remove(role)
+
+  async def on_guild_remove(self, guild: discord.Guild):
+      self.role_index.drop(guild)
+      self.guild_config.drop(guild.id)
+      self.triggers.drop(guild.id)
+      self.antispam.drop(guild.id)
+      self.antinuke.drop(guild.id)
+      self.voicemaster.drop(guild.id)
+        
   async def channel_ratelimit(self,message:discord.Message) -> typing.Optional[int]:
       cd=self.c_cd
       bucket=cd.get_bucket(message)
@@ -211,6 +297,8 @@ class Pride(commands.AutoShardedBot):
       
   async def on_message(self, message: discord.Message): 
       
+        if self.db and await self.antispam.check(message): return
+      
         channel_rl=await self.channel_ratelimit(message)
         member_rl=await self.member_ratelimit(message)
       
@@ -249,6 +337,7 @@ class Pride(commands.AutoShardedBot):
         
         cogs_loaded = await StartUp.loadcogs(self)
         print(f"✓ Loaded {cogs_loaded if isinstance(cogs_loaded, int) else 'N/A'} cogs")
+        self.command_index.build()
        
         if self.db:
             try:
@@ -257,6 +346,46 @@ class Pride(commands.AutoShardedBot):
             except Exception as e:
                 print(f"✗ Failed to create database tables: {e}")
                 print("  Database-dependent features may not work")
+        
+        self.errors.start()
+        if self.db: self.guild_config.start()
+        self.antispam.start()
+        self.antinuke.start()
+        if self.db:
+            self.levels.start()
+            self.seen.start()
+            self.counters.start()
+            await self.joins.start()
+            await self.voicemaster.start()
+        
+        if os.environ.get("METRICS_PORT"):
+            try:
+                self.metrics_server = await metrics.serve(os.environ.get("METRICS_HOST", "127.0.0.1"), int(os.environ["METRICS_PORT"]))
+                print(f"✓ Serving metrics on port {os.environ['METRICS_PORT']}")
+            except Exception as e:
+                print(f"✗ Failed to start metrics server: {e}")
+
+  async def close(self):
+        self.guild_config.stop()
+        self.antispam.stop()
+        self.antinuke.stop()
+        self.counters.stop()
+        self.voicemaster.stop()
+        await self.levels.close()
+        await self.seen.close()
+        await self.joins.close()
+        await self.errors.close()
+        if self.metrics_server: await self.metrics_server.cleanup()
+        await super().close()
+
+  async def add_cog(self, cog: commands.Cog, /, **kwargs) -> None:
+      await super().add_cog(cog, **kwargs)
+      self.command_index.invalidate()
+
+  async def remove_cog(self, name: str, /, **kwargs) -> typing.Optional[commands.Cog]:
+      cog = await super().remove_cog(name, **kwargs)
+      self.command_index.invalidate()
+      return cog
 
   async def get_context(self, message: discord.Message, cls=PrideContext) -> PrideContext:
       return await super().get_context(message, cls=cls)
\ No newline at end of file
@@ -0,0 +1,91 @@
+import asyncio, time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Set
+
+import discord
+from discord.ext import commands
+
+# counters.module -> count read from the guild cache
+MODULES: Dict[str, Callable[[discord.Guild], int]] = {
+    "members": lambda guild: guild.member_count or len(guild.members),
+    "humans": lambda guild: sum(not member.bot for member in guild.members),
+    "bots": lambda guild: sum(member.bot for member in guild.members),
+    "boosters": lambda guild: len(guild.premium_subscribers),
+    "boosts": lambda guild: guild.premium_subscription_count,
+}
+
+class Counters:
+    """Renames counter channels after member and boost changes without tripping the rename limit.
+
+    Events only mark the guild dirty. Every ``tick`` seconds the dirty
+    guilds' counts are computed from the cache and each channel whose name
+    is out of date is renamed, unless it has already been renamed ``limit``
+    times in the last ``window`` seconds; such guilds stay dirty and are
+    retried with whatever the count is by then.
+    """
+
+    def __init__(self, bot: commands.Bot, tick: float = 15.0, limit: int = 2, window: float = 600.0):
+        self.bot = bot
+        self.tick = tick
+        self.limit = limit
+        self.window = window
+        self.dirty: Set[int] = set()
+        self.renames: Dict[int, Deque[float]] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    def mark(self, guild_id: int) -> None:
+        self.dirty.add(guild_id)
+
+    def allowed(self, channel_id: int, now: float) -> bool:
+        renames = self.renames.get(channel_id)
+        if renames is None: return True
+        while renames and renames[0] <= now - self.window: renames.popleft()
+        return len(renames) < self.limit
+
+    def name(self, template: str, count: int) -> str:
+        for placeholder in ("{target}", "{count}"):
+            if placeholder in template: return template.replace(placeholder, f"{count:,}")[:100]
+        return f"{template} {count:,}"[:100]
+
+    async def apply(self, guild: discord.Guild) -> bool:
+        """Rename what is allowed, return whether anything is still out of date."""
+        config = await self.bot.guild_config.get(guild.id)
+        now = time.monotonic()
+        behind = False
+
+        for row in config.counters:
+            count = MODULES.get(row["module"])
+            channel = guild.get_channel(row["channel_id"] or 0)
+            if not count or not channel: continue
+
+            name = self.name(row["channel_name"] or row["module"], count(guild))
+            if channel.name == name: continue
+            if not self.allowed(channel.id, now):
+                behind = True
+                continue
+
+            self.renames.setdefault(channel.id, deque()).append(now)
+            try: await channel.edit(name=name, reason="Counter update")
+            except discord.HTTPException as e: print(f"Failed to update counter {channel.id}: {e}")
+        return behind
+
+    async def flush(self) -> None:
+        dirty, self.dirty = self.dirty, set()
+        for guild_id in dirty:
+            guild = self.bot.get_guild(guild_id)
+            if guild and await self.apply(guild): self.dirty.add(guild_id)
+
+        now = time.monotonic()
+        for channel_id in [channel_id for channel_id, renames in self.renames.items() if not renames or renames[-1] <= now - self.window]: del self.renames[channel_id]
+
+    async def flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            try: await self.flush()
+            except Exception as e: print(f"Failed to update counters: {e}")
+
+    def start(self) -> None:
+        if self.task is None: self.task = asyncio.create_task(self.flush_loop())
+
+    def stop(self) -> None:
+        if self.task: self.task.cancel()
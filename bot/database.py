@@ -1,5 +1,17 @@
+import os
 from discord.ext import commands
 
+def pool_options() -> dict:
+  """asyncpg pool settings, each overridable from the environment"""
+  return {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 5)),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 20)),
+    "max_queries": int(os.environ.get("DB_MAX_QUERIES", 50000)),
+    "max_inactive_connection_lifetime": float(os.environ.get("DB_MAX_INACTIVE_LIFETIME", 300)),
+    "statement_cache_size": int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 1024)),
+    "command_timeout": float(os.environ.get("DB_COMMAND_TIMEOUT", 30)),
+  }
+
 async def create_db(self: commands.Bot): 
   await self.db.execute("CREATE TABLE IF NOT EXISTS prefixes (guild_id BIGINT, prefix TEXT)")  
   await self.db.execute("CREATE TABLE IF NOT EXISTS selfprefix (user_id BIGINT, prefix TEXT)") 
@@ -109,4 +121,34 @@ async def create_db(self: commands.Bot):
   await self.db.execute("CREATE TABLE IF NOT EXISTS message_logs(guild_id BIGINT, channel_id BIGINT)")
   await self.db.execute("CREATE TABLE IF NOT EXISTS channel_logs(guild_id BIGINT, channel_id BIGINT)")
   await self.db.execute("CREATE TABLE IF NOT EXISTS role_logs(guild_id BIGINT, channel_id BIGINT)")
-  
\ No newline at end of file
+  
+  # columns the moderation cog reads and writes, plus a tiebreaker so listings can seek past equal timestamps
+  await self.db.execute("ALTER TABLE warns ADD COLUMN IF NOT EXISTS moderator_id BIGINT, ADD COLUMN IF NOT EXISTS timestamp TIMESTAMPTZ DEFAULT now(), ADD COLUMN IF NOT EXISTS id BIGSERIAL")
+  await self.db.execute("ALTER TABLE cases ADD COLUMN IF NOT EXISTS user_id BIGINT, ADD COLUMN IF NOT EXISTS moderator_id BIGINT, ADD COLUMN IF NOT EXISTS action TEXT, ADD COLUMN IF NOT EXISTS reason TEXT, ADD COLUMN IF NOT EXISTS timestamp TIMESTAMPTZ DEFAULT now(), ADD COLUMN IF NOT EXISTS case_id BIGSERIAL")
+  await self.db.execute("ALTER TABLE hardban ADD COLUMN IF NOT EXISTS user_id BIGINT, ADD COLUMN IF NOT EXISTS moderator_id BIGINT, ADD COLUMN IF NOT EXISTS reason TEXT, ADD COLUMN IF NOT EXISTS timestamp TIMESTAMPTZ DEFAULT now(), ADD COLUMN IF NOT EXISTS id BIGSERIAL")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS warns_guild_user_timestamp ON warns (guild_id, user_id, timestamp DESC, id DESC)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS cases_guild_user_timestamp ON cases (guild_id, user_id, timestamp DESC, case_id DESC)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS hardban_guild_timestamp ON hardban (guild_id, timestamp DESC, id DESC)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS error_code ON error (code)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS prefixes_guild ON prefixes (guild_id)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS selfprefix_user ON selfprefix (user_id)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS reskin_user ON reskin (user_id)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS hardban_guild_user ON hardban (guild_id, user_id)")
+  # levels and seen are upserted per member, drop duplicate rows (keeping the newest) before the unique indexes go on
+  await self.db.execute("""DO $$ BEGIN IF to_regclass('levels_guild_author') IS NULL THEN
+    DELETE FROM levels a USING levels b WHERE a.guild_id = b.guild_id AND a.author_id = b.author_id AND (coalesce(a.total_xp, 0), a.ctid) < (coalesce(b.total_xp, 0), b.ctid);
+    CREATE UNIQUE INDEX levels_guild_author ON levels (guild_id, author_id);
+  END IF; END $$""")
+  await self.db.execute("""DO $$ BEGIN IF to_regclass('seen_guild_user') IS NULL THEN
+    DELETE FROM seen a USING seen b WHERE a.guild_id = b.guild_id AND a.user_id = b.user_id AND (coalesce(a.time, 0), a.ctid) < (coalesce(b.time, 0), b.ctid);
+    CREATE UNIQUE INDEX seen_guild_user ON seen (guild_id, user_id);
+  END IF; END $$""")
+  await self.db.execute("""DO $$ BEGIN IF to_regclass('restore_guild_user') IS NULL THEN
+    DELETE FROM restore a USING restore b WHERE a.guild_id = b.guild_id AND a.user_id = b.user_id AND a.ctid < b.ctid;
+    CREATE UNIQUE INDEX restore_guild_user ON restore (guild_id, user_id);
+  END IF; END $$""")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS oldusernames_user_time ON oldusernames (user_id, time DESC)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS giveaway_finish ON giveaway (finish)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS gw_ended_message ON gw_ended (message_id)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS starboardmes_message ON starboardmes (message_id)")
+  await self.db.execute("CREATE INDEX IF NOT EXISTS skullboardmes_message ON skullboardmes (message_id)")
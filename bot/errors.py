@@ -0,0 +1,99 @@
+import asyncio, hashlib, secrets, time, traceback
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import asyncpg
+from discord.ext import commands
+
+COLUMNS = ["code", "error", "guild_id", "user_id", "command", "channel", "time"]
+
+class ErrorSink:
+    """Collects command and event errors and writes them to the ``error`` table in batches.
+
+    ``report`` never waits on the database: records go into a bounded queue
+    which a background task drains with ``COPY``. The same exception raised
+    from the same place again within ``window`` seconds reuses the first
+    code instead of being stored again.
+    """
+
+    def __init__(self, bot: commands.Bot, maxsize: int = 1000, batch_size: int = 200, interval: float = 5, window: float = 300):
+        self.bot = bot
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.window = window
+        self.recent: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.dropped = 0
+        self.lock = asyncio.Lock()
+        self.pending = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def fingerprint(self, error: BaseException, where: Optional[str]) -> str:
+        frames = traceback.extract_tb(error.__traceback__)
+        key = "|".join([type(error).__qualname__, where or ""] + [f"{f.filename}:{f.lineno}" for f in frames])
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def report(self, error: BaseException, ctx: Optional[commands.Context] = None, event: Optional[str] = None) -> str:
+        """Queue ``error`` and return the short code it can be looked up by."""
+        where = ctx.command.qualified_name if ctx and ctx.command else event
+        fingerprint = self.fingerprint(error, where)
+        now = time.monotonic()
+
+        seen = self.recent.get(fingerprint)
+        if seen and seen[1] > now: return seen[0]
+
+        code = secrets.token_hex(4)
+        self.recent[fingerprint] = (code, now + self.window)
+        self.recent.move_to_end(fingerprint)
+        while len(self.recent) > self.queue.maxsize: self.recent.popitem(last=False)
+
+        text = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        record = (
+            code, text[-4000:],
+            ctx.guild.id if ctx and ctx.guild else None,
+            ctx.author.id if ctx else None,
+            where,
+            ctx.channel.id if ctx else None,
+            int(time.time()),
+        )
+
+        try: self.queue.put_nowait(record)
+        except asyncio.QueueFull: self.dropped += 1
+        self.pending.set()
+        return code
+
+    def start(self) -> None:
+        if self.task is None: self.task = asyncio.create_task(self.flush_loop())
+
+    async def flush_loop(self) -> None:
+        while True:
+            await self.pending.wait()
+            # give the rest of a burst time to pile up so it lands in one COPY
+            await asyncio.sleep(self.interval)
+            self.pending.clear()
+            try: await self.flush()
+            except Exception as e: print(f"Failed to flush errors: {e}")
+
+    def drain(self) -> List[tuple]:
+        batch = []
+        while not self.queue.empty() and len(batch) < self.batch_size: batch.append(self.queue.get_nowait())
+        return batch
+
+    async def flush(self) -> None:
+        async with self.lock:
+            while batch := self.drain():
+                if not self.bot.db: continue
+                try:
+                    async with self.bot.db.acquire() as conn:
+                        await conn.copy_records_to_table("error", records=batch, columns=COLUMNS)
+                except (asyncpg.PostgresError, OSError) as e:
+                    print(f"Failed to write {len(batch)} errors: {e}")
+                    return
+
+    async def lookup(self, code: str) -> Optional[asyncpg.Record]:
+        await self.flush()
+        return await self.bot.db.fetchrow("SELECT code, error, guild_id, user_id, command, channel, time FROM error WHERE code = $1 LIMIT 1", code)
+
+    async def close(self) -> None:
+        if self.task: self.task.cancel()
+        await self.flush()
@@ -1,12 +1,20 @@
 from discord.ext import commands
-import discord, datetime, time
-from typing import Union
+import discord, datetime, time, asyncio, re
+from typing import Union, Optional, Dict, Tuple
+from collections import OrderedDict
 from math import log, floor
+from bot.pages import PageSource, EmbedPageSource
 
 
+MESSAGE_LINK = re.compile(r"(?:https?://(?:(?:ptb|canary)\.)?discord(?:app)?\.com/channels/)?(?P<guild_id>[0-9]+|@me)/(?P<channel_id>[0-9]+)/(?P<message_id>[0-9]+)")
+
 class Client(object): 
-  def __init__(self, bot: commands.Bot): 
+  def __init__(self, bot: commands.Bot, message_ttl: float=60, max_messages: int=1000): 
     self.bot = bot 
+    self.message_ttl = message_ttl
+    self.max_messages = max_messages
+    self.messages: "OrderedDict[int, Tuple[float, discord.Message]]" = OrderedDict()
+    self.fetching: Dict[int, asyncio.Future] = {}
     
   async def success(self, ctx: Union[commands.Context, discord.Interaction], message: str, ephemeral: bool=True) -> discord.Message: 
    if isinstance(ctx, commands.Context): return await ctx.reply(embed=discord.Embed(color=self.bot.color, description=f"{self.bot.yes} {ctx.author.mention}: {message}"))
@@ -20,10 +28,35 @@ class Client(object):
    if isinstance(ctx, commands.Context): return await ctx.reply(embed=discord.Embed(color=self.bot.error_color, description=f"{self.bot.warning} {ctx.author.mention}: {message}"))
    else: return await ctx.response.send_message(embed=discord.Embed(color=self.bot.color, description=f"{self.bot.warning} {ctx.user.mention}: {message}"), ephemeral=ephemeral)
    
-  async def link_to_message(self, link: str) -> discord.Message: 
-   link = link.replace("https://discord.com/channels/", "")
-   link = link.split("/")
-   return await self.bot.get_guild(int(link[0])).get_channel(int(link[1])).fetch_message(int(link[2]))  
+  async def link_to_message(self, link: str) -> Optional[discord.Message]: 
+   """Resolve a message link from the gateway cache, then recently fetched messages, then REST"""
+   match = MESSAGE_LINK.search(link)
+   if not match: return None
+   
+   message_id = int(match["message_id"])
+   message = self.bot._connection._get_message(message_id)
+   if message: return message
+   
+   cached = self.messages.get(message_id)
+   if cached and cached[0] > time.monotonic(): return cached[1]
+   
+   # concurrent lookups of the same link share one request
+   future = self.fetching.get(message_id)
+   if future is None:
+     guild_id = None if match["guild_id"] == "@me" else int(match["guild_id"])
+     future = self.fetching[message_id] = asyncio.ensure_future(self.fetch_message(guild_id, int(match["channel_id"]), message_id))
+     future.add_done_callback(lambda _: self.fetching.pop(message_id, None))
+   return await asyncio.shield(future)
+  
+  async def fetch_message(self, guild_id: Optional[int], channel_id: int, message_id: int) -> Optional[discord.Message]: 
+   channel = self.bot.get_channel(channel_id) or self.bot.get_partial_messageable(channel_id, guild_id=guild_id)
+   try: message = await channel.fetch_message(message_id)
+   except (discord.NotFound, discord.Forbidden): return None
+   
+   self.messages[message_id] = (time.monotonic() + self.message_ttl, message)
+   self.messages.move_to_end(message_id)
+   while len(self.messages) > self.max_messages: self.messages.popitem(last=False)
+   return message
 
   def is_dangerous(self, role: discord.Role) -> bool:
      permissions = role.permissions
@@ -136,49 +169,54 @@ class GoToModal(discord.ui.Modal, title="change the page"):
   page = discord.ui.TextInput(label="page", placeholder="change the page", max_length=3)
 
   async def on_submit(self, interaction: discord.Interaction) -> None:
-   if int(self.page.value) > len(self.embeds): return await interaction.client.ext.warning(interaction, f"You can only select a page **between** 1 and {len(self.embeds)}", ephemeral=True) 
-   await interaction.response.edit_message(embed=self.embeds[int(self.page.value)-1]) 
+   embed = await self.source.get_page(int(self.page.value)-1)
+   if embed is None:
+     if self.source.max_pages is None: return await interaction.client.ext.warning(interaction, "That page does not exist", ephemeral=True)
+     return await interaction.client.ext.warning(interaction, f"You can only select a page **between** 1 and {self.source.max_pages}", ephemeral=True) 
+   await interaction.response.edit_message(embed=embed) 
   
   async def on_error(self, interaction: discord.Interaction, error: Exception) -> None: 
     await interaction.client.ext.warning(interaction, "I am unable to change the page", ephemeral=True)
      
 class PaginatorView(discord.ui.View): 
-    def __init__(self, ctx: commands.Context, embeds: list): 
+    def __init__(self, ctx: commands.Context, source: Union[PageSource, list]): 
       super().__init__()  
-      self.embeds = embeds
+      self.source = source if isinstance(source, PageSource) else EmbedPageSource(source)
       self.ctx = ctx
       self.i = 0
       
     @discord.ui.button(emoji="<:filter:1263727034798968893>")
     async def goto(self, interaction: discord.Interaction, button: discord.ui.Button): 
-     if interaction.user.id != self.ctx.author.id: return await interaction.client.ext.send_warning(interaction, "You are not the author of this embed")     
+     if interaction.user.id != self.ctx.author.id: return await interaction.client.ext.warning(interaction, "You are not the author of this embed")     
      modal = GoToModal()
-     modal.embeds = self.embeds
+     modal.source = self.source
      await interaction.response.send_modal(modal)
      await modal.wait()
      try:
-      self.i = int(modal.page.value)-1
+      if await self.source.get_page(int(modal.page.value)-1) is not None: self.i = int(modal.page.value)-1
      except: pass 
      
     @discord.ui.button(emoji="<:left:1263727060078035066>", style=discord.ButtonStyle.secondary)
     async def left(self, interaction: discord.Interaction, button: discord.ui.Button): 
       if interaction.user.id != self.ctx.author.id: return await interaction.client.ext.warning(interaction, "You are not the author of this embed")            
       if self.i == 0: 
-        await interaction.response.edit_message(embed=self.embeds[-1])
-        self.i = len(self.embeds)-1
-        return
+        # wrapping around is only possible once we know where the last page is
+        if self.source.max_pages is None: return await interaction.response.defer()
+        self.i = self.source.max_pages-1
+        return await interaction.response.edit_message(embed=await self.source.get_page(self.i))
       self.i = self.i-1
-      return await interaction.response.edit_message(embed=self.embeds[self.i])
+      return await interaction.response.edit_message(embed=await self.source.get_page(self.i))
 
     @discord.ui.button(emoji="<:right:1263727130370637995>", style=discord.ButtonStyle.secondary)
     async def right(self, interaction: discord.Interaction, button: discord.ui.Button): 
       if interaction.user.id != self.ctx.author.id: return await interaction.client.ext.warning(interaction, "You are not the author of this embed")     
-      if self.i == len(self.embeds)-1: 
-        await interaction.response.edit_message(embed=self.embeds[0])
+      embed = await self.source.get_page(self.i + 1)
+      if embed is None: 
+        await interaction.response.edit_message(embed=await self.source.get_page(0))
         self.i = 0
         return 
       self.i = self.i + 1  
-      return await interaction.response.edit_message(embed=self.embeds[self.i])   
+      return await interaction.response.edit_message(embed=embed)   
     
     @discord.ui.button(emoji="<:deny:1263727013433184347>", style=discord.ButtonStyle.secondary)
     async def delete(self, interaction: discord.Interaction, button: discord.ui.Button): 
@@ -0,0 +1,144 @@
+import asyncio, os
+from typing import Any, Dict, List, Optional
+
+import asyncpg, orjson
+from discord.ext import commands
+
+CHANNEL = "guild_config"
+
+# table -> columns loaded for every guild, each table becomes a list of dicts on GuildConfig
+SECTIONS: Dict[str, List[str]] = {
+    "prefixes": ["prefix"],
+    "settings_prefix": ["toggled"],
+    "disablecommand": ["command"],
+    "welcome": ["channel_id", "mes"],
+    "leave": ["channel_id", "mes"],
+    "boost": ["channel_id", "mes"],
+    "joindm": ["message"],
+    "invoke": ["command", "embed"],
+    "dm": ["command", "embed"],
+    "autorole": ["role_id"],
+    "pingonjoin": ["channel_id"],
+    "mediaonly": ["channel_id"],
+    "antiinvite": ["guild_id"],
+    "chatfilter": ["word"],
+    "autoreact": ["trigger", "emojis"],
+    "autoresponses": ["key", "response"],
+    "whitelist": ["module", "object_id", "mode"],
+    "antispam": ["seconds", "count", "punishment"],
+    "antinuke": ["module", "punishment", "threshold"],
+    "antinuke_toggle": ["logs"],
+    "antinuke_whitelist": ["user_id"],
+    "antinuke_admins": ["user_id"],
+    "mod": ["channel_id", "jail_id", "role_id"],
+    "vanity": ["vanity_message", "vanity_string", "role_id"],
+    "counters": ["channel_type", "channel_id", "channel_name", "module"],
+    "starboard": ["channel_id", "count", "emoji_id", "emoji_text"],
+    "skullboard": ["channel_id", "count", "emoji_id", "emoji_text"],
+    "levelsetup": ["channel_id", "destination"],
+    "levelroles": ["level", "role_id"],
+    "voicemaster": ["channel_id", "interface"],
+    "tickets": ["message", "channel_id", "category", "color", "logs"],
+    "ticket_support": ["role_id"],
+    "member_logs": ["channel_id"],
+    "voice_logs": ["channel_id"],
+    "server_logs": ["channel_id"],
+    "message_logs": ["channel_id"],
+    "channel_logs": ["channel_id"],
+    "role_logs": ["channel_id"],
+}
+
+LOAD = "SELECT " + ", ".join(
+    f"(SELECT coalesce(json_agg(t), '[]') FROM (SELECT {', '.join(columns)} FROM {table} WHERE guild_id = $1) t) AS {table}"
+    for table, columns in SECTIONS.items()
+)
+
+class GuildConfig:
+    """Every setting of one guild, loaded in a single query.
+
+    Each table in ``SECTIONS`` is an attribute holding its rows as dicts.
+    """
+
+    def __init__(self, guild_id: int, data: Dict[str, List[Dict[str, Any]]]):
+        self.guild_id = guild_id
+        for table in SECTIONS: setattr(self, table, data.get(table) or [])
+
+    def __repr__(self) -> str:
+        return f"<GuildConfig guild_id={self.guild_id}>"
+
+    def first(self, table: str) -> Optional[Dict[str, Any]]:
+        rows = getattr(self, table)
+        return rows[0] if rows else None
+
+    def enabled(self, table: str) -> bool:
+        return bool(getattr(self, table))
+
+    @property
+    def prefix(self) -> Optional[str]:
+        row = self.first("prefixes")
+        return row["prefix"] if row else None
+
+class GuildConfigCache:
+    """Keeps a ``GuildConfig`` per guild in memory.
+
+    Writers call ``invalidate`` after changing a guild's settings, which
+    publishes the guild id with ``NOTIFY`` so every process listening on the
+    channel drops its copy and reloads it on next use.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.configs: Dict[int, GuildConfig] = {}
+        self.loading: Dict[int, asyncio.Future] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    def get_cached(self, guild_id: int) -> Optional[GuildConfig]:
+        return self.configs.get(guild_id)
+
+    async def get(self, guild_id: int) -> GuildConfig:
+        config = self.configs.get(guild_id)
+        if config: return config
+
+        future = self.loading.get(guild_id)
+        if future is None:
+            future = self.loading[guild_id] = asyncio.ensure_future(self.load(guild_id))
+            future.add_done_callback(lambda _: self.loading.pop(guild_id, None))
+        return await asyncio.shield(future)
+
+    async def load(self, guild_id: int) -> GuildConfig:
+        row = await self.bot.db.fetchrow(LOAD, guild_id)
+        config = GuildConfig(guild_id, {table: orjson.loads(row[table]) for table in SECTIONS} if row else {})
+        self.configs[guild_id] = config
+        return config
+
+    def drop(self, guild_id: int) -> None:
+        self.configs.pop(guild_id, None)
+
+    async def invalidate(self, guild_id: int) -> None:
+        self.drop(guild_id)
+        if self.bot.db: await self.bot.db.execute("SELECT pg_notify($1, $2)", CHANNEL, str(guild_id))
+
+    def notified(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        self.drop(int(payload))
+
+    def start(self) -> None:
+        if self.task is None and os.environ.get("DATABASE_URL"): self.task = asyncio.create_task(self.listen())
+
+    async def listen(self) -> None:
+        # a dedicated connection, so listening never holds one of the pool's
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(os.environ["DATABASE_URL"])
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self.notified)
+                await closed.wait()
+            except (OSError, asyncpg.PostgresError) as e:
+                print(f"Guild config listener disconnected: {e}")
+
+            # notifications may have been missed while disconnected
+            self.configs.clear()
+            await asyncio.sleep(5)
+
+    def stop(self) -> None:
+        if self.task: self.task.cancel()
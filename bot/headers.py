@@ -1,6 +1,7 @@
 from typing import Optional
 import aiohttp, humanize, orjson, random, os
 from io import BytesIO
+from bot.metrics import trace
 
 class Session:
   def __init__(self, headers: Optional[dict] = None, proxy: bool = False) -> None:
@@ -13,19 +14,19 @@ class Session:
   
   async def post_json(self, url: str, headers: Optional[dict]=None, params: Optional[dict]=None, proxy: Optional[str]=None):
 
-    async with aiohttp.ClientSession(headers=headers or self.headers) as cs: 
+    async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace]) as cs: 
      async with cs.post(url, headers=headers, params=params, proxy=proxy) as r: 
        return await r.json()
      
   async def post_text(self, url: str, data: Optional[dict] = None, headers: Optional[dict] = None, params: Optional[dict] = None, proxy: bool = False, ssl: Optional[bool] = None) -> str:
 
-        async with aiohttp.ClientSession(headers=headers or self.headers, json_serialize=orjson.dumps) as session:
+        async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace], json_serialize=orjson.dumps) as session:
             async with session.post(url, data=data, params=params, proxy=self.proxy(), ssl=ssl) as response:
                 return await response.text()
               
   async def async_post_bytes(self, url: str, data: Optional[dict] = None, headers: Optional[dict] = None, params: Optional[dict] = None, proxy: bool = False, ssl: Optional[bool] = None) -> bytes:
 
-        async with aiohttp.ClientSession(headers=headers or self.headers, json_serialize=orjson.dumps) as session: 
+        async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace], json_serialize=orjson.dumps) as session: 
             async with session.post(url, data=data, params=params, proxy=self.proxy(), ssl=ssl) as response:
                 return await response.read()
               
@@ -34,7 +35,7 @@ class Session:
         total_size = 0
         data = b""
 
-        async with aiohttp.ClientSession(headers=headers or self.headers, json_serialize=orjson.dumps) as session:
+        async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace], json_serialize=orjson.dumps) as session:
             async with session.get(url, params=params, proxy=self.proxy(), ssl=ssl) as response:
                 while True:
                     chunk = await response.content.read(4*1024)
@@ -62,19 +63,19 @@ class Session:
   
   async def get_json(self, url: str, headers: Optional[dict]=None, params: Optional[dict]=None, proxy: Optional[str]=None):
     
-   async with aiohttp.ClientSession(headers=headers or self.headers) as cs: 
+   async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace]) as cs: 
      async with cs.get(url, headers=headers, params=params, proxy=proxy) as r: 
        return await r.json()
 
   async def get_text(self, url: str, headers: Optional[dict]=None, params: Optional[dict]=None, proxy: Optional[str]=None): 
 
-   async with aiohttp.ClientSession(headers=headers or self.headers) as cs: 
+   async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace]) as cs: 
      async with cs.get(url, headers=headers, params=params, proxy=proxy) as r: 
        return await r.text()
 
   async def get_bytes(self, url: str, headers: Optional[dict]=None, params: Optional[dict]=None, proxy: Optional[str]=None):
     
-    async with aiohttp.ClientSession(headers=headers or self.headers) as cs: 
+    async with aiohttp.ClientSession(headers=headers or self.headers, trace_configs=[trace]) as cs: 
       async with cs.get(url, headers=headers, params=params, proxy=proxy) as r: 
        return await r.read()  
       
@@ -1,10 +1,11 @@
 import discord, os
 from discord.ext.commands import Context 
 from discord import Embed, utils, ButtonStyle, Message
-from typing import Any, Union, Dict, Optional, List, Sequence
+from typing import Any, Union, Dict, Optional, List, Sequence, AsyncIterable
 from discord.ui import View
 from discord.ext import commands
 from bot.ext import PaginatorView
+from bot.pages import PageSource, ListPageSource, AsyncIteratorPageSource, EmbedPageSource, fit, TITLE_LIMIT
 
 class PrideContext(Context): 
   flags: Dict[str, Any] = {}
@@ -13,27 +14,15 @@ class PrideContext(Context):
        
        if not message.guild: return ";"
        
-       check = await bot.db.fetchrow("SELECT * FROM selfprefix WHERE user_id = $1", message.author.id) 
-       if check: selfprefix = check["prefix"]
+       guildprefix, selfprefix = await bot.repo.prefixes.get(message.guild.id, message.author.id)
+       guildprefix = guildprefix or ";"
        
-       res = await bot.db.fetchrow("SELECT * FROM prefixes WHERE guild_id = $1", message.guild.id) 
-       if res: guildprefix = res["prefix"]
-       
-       else: guildprefix = ";"    
-       
-       if not check and res: selfprefix = res["prefix"]
-       elif not check and not res: selfprefix = ";"
-       
-       return guildprefix, selfprefix 
+       return guildprefix, selfprefix or guildprefix 
 
   def find_role(self, name: str): 
    
-   for role in self.guild.roles:
-    
-    if role.name == "@everyone": continue  
-    
-    if name.lower() in role.name.lower(): return role 
-   return None 
+   roles = self.bot.role_index.search(self.guild, name, limit=1)
+   return roles[0] if roles else None 
  
   async def success(self, message: str) -> discord.Message:  
     return await self.reply(embed=discord.Embed(color=self.bot.color, description=f"{self.bot.yes} {self.author.mention}: {message}") )
@@ -53,33 +42,20 @@ class PrideContext(Context):
   async def lastfm_message(self, message: str) -> discord.Message: 
     return await self.reply(embed=discord.Embed(color=0xFFFFFF, description=f"> <:lastfm:1263727050309632031> {self.author.mention}: {message}"))  
   
-  async def paginate(self, contents: List[str], title:str=None, author: dict={'name': '', 'icon_url': None}):
-   iterator = [m for m in utils.as_chunks(contents, 10)]
-   embeds = [
-            Embed(
-                color=self.bot.color,
-                title=title,
-                description="\n".join(
-                    [f"{f}" for f in m]
-                ),
-            ).set_author(**author)
-            for m in iterator
-        ]
-   return await self.paginator(embeds)
+  def page_source(self, contents: Union[Sequence[str], AsyncIterable[str]], title: str=None, author: dict={'name': '', 'icon_url': None}, numbered: bool=False, per_page: int=10) -> PageSource:
+   
+   def render(entries: List[str], offset: int) -> Embed:
+     lines = [f"`{offset+i}.` {f}" for i, f in enumerate(entries, 1)] if numbered else [f"{f}" for f in entries]
+     return Embed(color=self.bot.color, title=title[:TITLE_LIMIT] if title else title, description=fit(lines)).set_author(**author)
+   
+   if isinstance(contents, AsyncIterable): return AsyncIteratorPageSource(contents, per_page, render)
+   return ListPageSource(contents, per_page, render)
   
-  async def index(self, contents: List[str], title:str=None, author: dict={'name': '', 'icon_url': None}):
-   iterator = [m for m in utils.as_chunks(contents, 10)]
-   embeds = [
-            Embed(
-                color=self.bot.color,
-                title=title,
-                description="\n".join(
-                    [f"`{(m.index(f)+1)+(iterator.index(m)*10)}.` {f}" for f in m]
-                ),
-            ).set_author(**author)
-            for m in iterator
-        ]
-   return await self.paginator(embeds)
+  async def paginate(self, contents: Union[Sequence[str], AsyncIterable[str]], title:str=None, author: dict={'name': '', 'icon_url': None}):
+   return await self.paginator(self.page_source(contents, title, author))
+  
+  async def index(self, contents: Union[Sequence[str], AsyncIterable[str]], title:str=None, author: dict={'name': '', 'icon_url': None}):
+   return await self.paginator(self.page_source(contents, title, author, numbered=True))
   
   async def create_pages(self): 
    embeds = []
@@ -100,11 +76,15 @@ class PrideContext(Context):
      
    return await self.paginator(embeds)
     
-  async def paginator(self, embeds: List[Union[Embed, str]]) -> Message:
+  async def paginator(self, embeds: Union[List[Embed], PageSource]) -> Message:
         
-        if len(embeds) == 1: return await self.reply(embed=embeds[0]) 
-        view = PaginatorView(self, embeds)
-        view.message = await self.reply(embed=embeds[0], view=view) 
+        source = embeds if isinstance(embeds, PageSource) else EmbedPageSource(embeds)
+        embed = await source.get_page(0)
+        more = source.has_next(0)
+        if more is None: more = await source.get_page(1) is not None
+        if not more: return await self.reply(embed=embed) 
+        view = PaginatorView(self, source)
+        view.message = await self.reply(embed=embed, view=view) 
 
   async def create_pages(self):
         """Create pages for group commands"""
@@ -113,21 +93,22 @@ class PrideContext(Context):
   async def reply(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None, view: Optional[View] = None, mention_author: Optional[bool] = False, file: Optional[discord.File] = discord.utils.MISSING,
         files: Optional[Sequence[discord.File]] = discord.utils.MISSING) -> discord.Message:
    
-   reskin = await self.bot.db.fetchrow("SELECT * FROM reskin WHERE user_id = $1 AND toggled = $2", self.author.id, True)
-   if reskin != None and reskin['toggled']:
+   reskin = await self.bot.repo.reskin.get(self.author.id)
+   if reskin:
      
      hook = await self.webhook(self.message.channel)
      
      if view == None: return await hook.send(content=content, embed=embed, username=reskin['name'], avatar_url=reskin['avatar'], file=file)
      
      return await hook.send(content=content, embed=embed, username=reskin['name'], avatar_url=reskin['avatar'], view=view, file=file)
-   return await self.send(content=content, embed=embed, reference=self.message, view=view, mention_author=mention_author, file=file)
+   # reskin was already checked above, so skip the lookup in send
+   return await self.channel.send(content=content, embed=embed, reference=self.message, view=view, mention_author=mention_author, file=file)
  
   async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None, view: Optional[View] = discord.utils.MISSING, mention_author: Optional[bool] = False, allowed_mentions: discord.AllowedMentions = discord.utils.MISSING,  reference: Optional[Union[discord.Message, discord.MessageReference, discord.PartialMessage]] = None, file: Optional[discord.File] = discord.utils.MISSING,
         files: Optional[Sequence[discord.File]] = discord.utils.MISSING) -> discord.Message:
    
-   reskin = await self.bot.db.fetchrow("SELECT * FROM reskin WHERE user_id = $1 AND toggled = $2", self.author.id, True)
-   if reskin != None and reskin['toggled']:
+   reskin = await self.bot.repo.reskin.get(self.author.id)
+   if reskin:
      
      hook = await self.webhook(self.message.channel)
      return await hook.send(content=content, embed=embed, username=reskin['name'], avatar_url=reskin['avatar'], view=view, allowed_mentions=allowed_mentions, file=file)
@@ -0,0 +1,150 @@
+import asyncio, json
+from typing import Dict, List, Set, Tuple
+
+import asyncpg
+import discord
+from discord.ext import commands
+
+class Joins:
+    """Everything that happens when a member joins, batched per guild.
+
+    Joins are collected for ``window`` seconds (or until ``max_batch``
+    members) and handled together: the guild config is read once, roles to
+    restore are taken out of ``restore`` in one query, autoroles and
+    restored roles go out in one ``add_roles`` call per member, ping on join
+    mentions the whole batch in one message and welcome messages are packed
+    into as few messages as fit. Hardbanned users are banned right away,
+    checked against a set loaded at startup.
+    """
+
+    RESTORE = "DELETE FROM restore WHERE guild_id = $1 AND user_id = ANY($2::bigint[]) RETURNING user_id, roles"
+    SAVE = "INSERT INTO restore (guild_id, user_id, roles) VALUES ($1, $2, $3) ON CONFLICT (guild_id, user_id) DO UPDATE SET roles = EXCLUDED.roles"
+
+    def __init__(self, bot: commands.Bot, window: float = 2.0, max_batch: int = 100):
+        self.bot = bot
+        self.window = window
+        self.max_batch = max_batch
+        self.pending: Dict[int, List[discord.Member]] = {}
+        self.leaving: Dict[Tuple[int, int], str] = {}
+        self.hardbanned: Dict[int, Set[int]] = {}
+        self.loaded = False
+
+    async def start(self) -> None:
+        try: rows = await self.bot.db.fetch("SELECT guild_id, user_id FROM hardban WHERE user_id IS NOT NULL")
+        except (asyncpg.PostgresError, OSError) as e: return print(f"Failed to load hardbans, checking them per join: {e}")
+        for row in rows: self.hardbanned.setdefault(row["guild_id"], set()).add(row["user_id"])
+        self.loaded = True
+
+    def hardban(self, guild_id: int, user_id: int) -> None:
+        self.hardbanned.setdefault(guild_id, set()).add(user_id)
+
+    async def is_hardbanned(self, guild_id: int, user_id: int) -> bool:
+        if self.loaded: return user_id in self.hardbanned.get(guild_id, ())
+        return await self.bot.repo.hardbans.exists(guild_id, user_id)
+
+    async def handle(self, member: discord.Member) -> None:
+        if await self.is_hardbanned(member.guild.id, member.id):
+            try: await member.ban(reason="Hardbanned")
+            except discord.HTTPException: pass
+            return
+
+        batch = self.pending.setdefault(member.guild.id, [])
+        batch.append(member)
+        if len(batch) >= self.max_batch: asyncio.ensure_future(self.flush(member.guild.id))
+        elif len(batch) == 1: asyncio.get_running_loop().call_later(self.window, lambda guild_id=member.guild.id: asyncio.ensure_future(self.flush(guild_id)))
+
+    def left(self, member: discord.Member) -> None:
+        roles = [role.id for role in member.roles if not role.is_default() and not role.managed]
+        if not roles: return
+        if not self.leaving: asyncio.get_running_loop().call_later(self.window, lambda: asyncio.ensure_future(self.save()))
+        self.leaving[(member.guild.id, member.id)] = json.dumps(roles)
+
+    async def save(self) -> None:
+        leaving, self.leaving = self.leaving, {}
+        if not leaving or not self.bot.db: return
+        try: await self.bot.db.executemany(self.SAVE, [(guild_id, user_id, roles) for (guild_id, user_id), roles in leaving.items()])
+        except (asyncpg.PostgresError, OSError) as e: print(f"Failed to save roles of {len(leaving)} members: {e}")
+
+    async def restored(self, guild: discord.Guild, members: List[discord.Member]) -> Dict[int, List[int]]:
+        # members that left and came back within one window were never written
+        roles = {member.id: json.loads(self.leaving.pop((guild.id, member.id))) for member in members if (guild.id, member.id) in self.leaving}
+        for row in await self.bot.db.fetch(self.RESTORE, guild.id, [member.id for member in members]):
+            try: roles.setdefault(row["user_id"], json.loads(row["roles"] or "[]"))
+            except ValueError: pass
+        return roles
+
+    def pack(self, rendered: List[dict]) -> List[dict]:
+        """Combine rendered messages into as few as fit in 2000 characters and 10 embeds of 6000 characters in total."""
+        messages = []
+        sizes = []
+        for message in rendered:
+            content, embed = message.get("content"), message.get("embed")
+            size = len(embed) if embed else 0
+            last = messages[-1] if messages else None
+            if (
+                last is None
+                or (content and len(last["content"] or "") + len(content) + 1 > 2000)
+                or (embed and (len(last["embeds"]) >= 10 or sizes[-1] + size > 6000))
+            ):
+                last = {"content": None, "embeds": []}
+                messages.append(last)
+                sizes.append(0)
+            if content: last["content"] = f"{last['content']}\n{content}" if last["content"] else content
+            if embed:
+                last["embeds"].append(embed)
+                sizes[-1] += size
+        return messages
+
+    async def send(self, channel: discord.abc.Messageable, **kwargs) -> None:
+        try: await channel.send(allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False), **kwargs)
+        except discord.HTTPException as e: print(f"Failed to send join messages to {getattr(channel, 'id', channel)}: {e}")
+
+    async def add_roles(self, member: discord.Member, roles: List[discord.Role]) -> None:
+        # atomic=False makes it a single member edit instead of one request per role
+        try: await member.add_roles(*roles, reason="Autorole and role restore", atomic=False)
+        except discord.HTTPException: pass
+
+    async def dm(self, member: discord.Member, source: str) -> None:
+        try: await member.send(**self.bot.templates.render(member, source))
+        except discord.HTTPException: pass
+
+    async def flush(self, guild_id: int) -> None:
+        batch = self.pending.pop(guild_id, None)
+        guild = self.bot.get_guild(guild_id)
+        if not batch or not guild: return
+        members = [member for member in batch if guild.get_member(member.id)]
+        if not members: return
+
+        try:
+            config = await self.bot.guild_config.get(guild_id)
+            restored = await self.restored(guild, members)
+        except (asyncpg.PostgresError, OSError) as e:
+            return print(f"Failed to handle {len(members)} joins in {guild_id}: {e}")
+
+        tasks = []
+        me = guild.me
+        assignable = lambda role: role and not role.managed and not role.is_default() and role < me.top_role
+        autoroles = [role for role in (guild.get_role(row["role_id"] or 0) for row in config.autorole) if assignable(role)]
+        for member in members:
+            # dangerous roles are never handed back, whoever was stripped of them has to get them from a moderator
+            roles = autoroles + [role for role in map(guild.get_role, restored.get(member.id, ())) if assignable(role) and not self.bot.ext.is_dangerous(role) and role not in autoroles]
+            if roles and me.guild_permissions.manage_roles: tasks.append(self.add_roles(member, roles))
+
+        for row in config.pingonjoin:
+            channel = guild.get_channel(row["channel_id"] or 0)
+            if not channel: continue
+            for message in self.pack([{"content": member.mention} for member in members]): tasks.append(self.send(channel, content=message["content"].replace("\n", " "), delete_after=3))
+
+        welcome = config.first("welcome")
+        channel = guild.get_channel(welcome["channel_id"] or 0) if welcome and welcome["mes"] else None
+        if channel:
+            for message in self.pack([self.bot.templates.render(member, welcome["mes"]) for member in members]): tasks.append(self.send(channel, **message))
+
+        joindm = config.first("joindm")
+        if joindm and joindm["message"]:
+            for member in members: tasks.append(self.dm(member, joindm["message"]))
+
+        await asyncio.gather(*tasks)
+
+    async def close(self) -> None:
+        await self.save()
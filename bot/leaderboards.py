@@ -0,0 +1,47 @@
+from typing import Dict, List, Optional, Tuple
+
+from discord.ext import commands
+
+class Leaderboards:
+    """Per-guild XP leaderboards in Redis sorted sets, keyed ``levels:<guild_id>``.
+
+    ``Levels`` adds every batch of XP it writes with ``ZINCRBY``, so ranks
+    are an O(log n) ``ZREVRANK`` and pages a ``ZREVRANGE`` instead of a sort
+    over the levels table. ``rebuild`` re-seeds a guild from Postgres.
+    """
+
+    SEED = "SELECT author_id, total_xp FROM levels WHERE guild_id = $1 AND total_xp > 0"
+
+    def __init__(self, bot: commands.Bot, chunk: int = 5000):
+        self.bot = bot
+        self.chunk = chunk
+
+    def key(self, guild_id: int) -> str:
+        return f"levels:{guild_id}"
+
+    async def add(self, deltas: Dict[Tuple[int, int], int]) -> None:
+        async with self.bot.redis.pipeline(transaction=False) as pipe:
+            for (guild_id, author_id), delta in deltas.items(): pipe.zincrby(self.key(guild_id), delta, author_id)
+            await pipe.execute()
+
+    async def rank(self, guild_id: int, member_id: int) -> Optional[int]:
+        """The member's 1-based position, ``None`` when they have no XP."""
+        rank = await self.bot.redis.zrevrank(self.key(guild_id), member_id)
+        return rank + 1 if rank is not None else None
+
+    async def count(self, guild_id: int) -> int:
+        return await self.bot.redis.zcard(self.key(guild_id))
+
+    async def range(self, guild_id: int, start: int, limit: int) -> List[Tuple[int, int]]:
+        """(member id, total XP) pairs from position ``start``, highest first."""
+        return [(int(member), int(score)) for member, score in await self.bot.redis.zrevrange(self.key(guild_id), start, start + limit - 1, withscores=True)]
+
+    async def rebuild(self, guild_id: int) -> int:
+        rows = await self.bot.db.fetch(self.SEED, guild_id)
+        key = self.key(guild_id)
+        # one MULTI so readers never see the set half built
+        async with self.bot.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            for i in range(0, len(rows), self.chunk): pipe.zadd(key, {row['author_id']: row['total_xp'] for row in rows[i:i + self.chunk]})
+            await pipe.execute()
+        return len(rows)
@@ -0,0 +1,144 @@
+import asyncio, random, time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from bot.guildconfig import GuildConfig
+
+MAX_LEVEL = 1000
+
+def required(level: int) -> int:
+    """XP needed to go from ``level`` to the next one."""
+    return 5 * level ** 2 + 50 * level + 100
+
+# THRESHOLDS[n] is the total XP at which level n starts
+THRESHOLDS: List[int] = list(accumulate((required(level) for level in range(MAX_LEVEL)), initial=0))
+
+def level_for(total: int) -> int:
+    return bisect_right(THRESHOLDS, total) - 1
+
+def progress(total: int) -> Tuple[int, int]:
+    """The level reached with ``total`` XP and the XP gained within it."""
+    level = level_for(total)
+    return level, total - THRESHOLDS[level]
+
+class Levels:
+    """Write-behind XP for guilds with leveling set up.
+
+    Gains are added to members' totals in memory and the deltas are written
+    every ``interval`` seconds in one upsert, and once more on shutdown. A
+    member's total is read from the database the first time they gain XP
+    and kept while they stay active; members idle for ``idle`` seconds are
+    forgotten after their deltas are written. Level roles and the level up
+    message only happen when a gain crosses into a new level. Written deltas
+    are also added to the guild's ``Leaderboards`` sorted set.
+    """
+
+    TOTAL = "SELECT total_xp FROM levels WHERE guild_id = $1 AND author_id = $2"
+    UPSERT = """
+        INSERT INTO levels (guild_id, author_id, exp, level, total_xp)
+        SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::integer[], $4::integer[], $5::integer[])
+        ON CONFLICT (guild_id, author_id) DO UPDATE SET
+            exp = EXCLUDED.exp, level = EXCLUDED.level, total_xp = levels.total_xp + EXCLUDED.total_xp
+    """
+
+    def __init__(self, bot: commands.Bot, interval: float = 5.0, cooldown: float = 60.0, gain: Tuple[int, int] = (15, 25), idle: float = 3600.0):
+        self.bot = bot
+        self.interval = interval
+        self.cooldown = cooldown
+        self.gain = gain
+        self.idle = idle
+        self.totals: Dict[Tuple[int, int], int] = {}
+        self.pending: Dict[Tuple[int, int], int] = {}
+        self.last: Dict[Tuple[int, int], float] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    async def total(self, guild_id: int, member_id: int, cache: bool = True) -> int:
+        """A member's total XP, including gains not written yet.
+
+        Read-only lookups pass ``cache=False``, only members gaining XP are
+        kept, since eviction follows their last gain.
+        """
+        total = self.totals.get((guild_id, member_id))
+        if total is None:
+            total = await self.bot.db.fetchval(self.TOTAL, guild_id, member_id) or 0
+            if cache: self.totals[(guild_id, member_id)] = total
+        return total
+
+    async def handle(self, message: discord.Message) -> None:
+        if not message.guild or message.author.bot or not isinstance(message.author, discord.Member): return
+        config = await self.bot.guild_config.get(message.guild.id)
+        if not config.enabled("levelsetup"): return
+
+        key = (message.guild.id, message.author.id)
+        now = time.monotonic()
+        if now - self.last.get(key, -self.cooldown) < self.cooldown: return
+        self.last[key] = now
+
+        before = await self.total(*key)
+        amount = random.randint(*self.gain)
+        self.totals[key] = before + amount
+        self.pending[key] = self.pending.get(key, 0) + amount
+
+        old, new = level_for(before), level_for(before + amount)
+        if new > old: await self.level_up(message, config, old, new)
+
+    async def level_up(self, message: discord.Message, config: GuildConfig, old: int, new: int) -> None:
+        member = message.author
+        roles = [role for role in (message.guild.get_role(row["role_id"]) for row in config.levelroles if old < row["level"] <= new) if role and role not in member.roles and role.is_assignable()]
+        if roles:
+            try: await member.add_roles(*roles, reason=f"Reached level {new}")
+            except discord.HTTPException: pass
+
+        setup = config.first("levelsetup")
+        destination = member if setup["destination"] == "dms" else message.guild.get_channel(setup["channel_id"] or 0) or message.channel
+        try: await destination.send(f"{member.mention} reached level **{new}**", allowed_mentions=discord.AllowedMentions(users=[member]))
+        except discord.HTTPException: pass
+
+    async def flush(self) -> None:
+        if not self.pending: return
+        pending, self.pending = self.pending, {}
+
+        guild_ids, author_ids, exps, levels, deltas = [], [], [], [], []
+        for (guild_id, author_id), delta in pending.items():
+            level, exp = progress(self.totals[(guild_id, author_id)])
+            guild_ids.append(guild_id)
+            author_ids.append(author_id)
+            exps.append(exp)
+            levels.append(level)
+            deltas.append(delta)
+
+        try:
+            await self.bot.db.execute(self.UPSERT, guild_ids, author_ids, exps, levels, deltas)
+        except Exception as e:
+            print(f"Failed to write XP for {len(pending)} members: {e}")
+            for key, delta in pending.items(): self.pending[key] = self.pending.get(key, 0) + delta
+            return
+
+        if self.bot.redis:
+            try: await self.bot.leaderboards.add(pending)
+            except Exception as e: print(f"Failed to update leaderboards for {len(pending)} members: {e}")
+
+    def evict(self) -> None:
+        """Forget members idle for ``idle`` seconds, whose XP has been written."""
+        cutoff = time.monotonic() - self.idle
+        for key in [key for key, last in self.last.items() if last < cutoff and key not in self.pending]:
+            del self.last[key]
+            self.totals.pop(key, None)
+
+    async def flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+            # runs on idle guilds too, where flush returns early
+            self.evict()
+
+    def start(self) -> None:
+        if self.task is None: self.task = asyncio.create_task(self.flush_loop())
+
+    async def close(self) -> None:
+        if self.task: self.task.cancel()
+        if self.bot.db: await self.flush()
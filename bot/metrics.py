@@ -0,0 +1,115 @@
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from aiohttp import web, TraceConfig
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra: pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{format_labels(self.labels, labels)} {value}" for labels, value in self.values.items()]
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # per label set: a count for every bucket plus +Inf, then the sum
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.values.get(labels)
+        if series is None: series = self.values[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, series in self.values.items():
+            total = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                total += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {total}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {total}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[object] = []
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+COMMANDS = registry.counter("pride_commands_total", "Commands invoked", ["command", "status"])
+COMMAND_LATENCY = registry.histogram("pride_command_seconds", "Command latency", ["command"])
+DB_LATENCY = registry.histogram("pride_db_query_seconds", "Database query latency")
+REDIS_LATENCY = registry.histogram("pride_redis_command_seconds", "Redis command latency", ["command"])
+GATEWAY_EVENTS = registry.counter("pride_gateway_events_total", "Gateway events received", ["event"])
+HTTP_LATENCY = registry.histogram("pride_http_request_seconds", "Outgoing HTTP request latency", ["method", "host"])
+
+async def on_request_start(session, context, params) -> None:
+    context.start = time.perf_counter()
+
+async def on_request_end(session, context, params) -> None:
+    HTTP_LATENCY.observe(time.perf_counter() - context.start, params.method, params.url.host or "")
+
+trace = TraceConfig()
+trace.on_request_start.append(on_request_start)
+trace.on_request_end.append(on_request_end)
+trace.on_request_exception.append(on_request_end)
+
+async def serve(host: str, port: int, registry: Registry = registry) -> web.AppRunner:
+    """Serve ``/metrics`` on ``host:port`` until the returned runner is cleaned up."""
+
+    async def metrics(request: web.Request) -> web.Response:
+        return web.Response(body=registry.render().encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
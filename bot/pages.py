@@ -0,0 +1,159 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, AsyncIterable, Awaitable, Callable, List, Optional, Sequence, Union
+
+from discord import Embed
+
+Renderer = Callable[[List[Any], int], Union[Embed, Awaitable[Embed]]]
+
+DESCRIPTION_LIMIT = 4096
+TITLE_LIMIT = 256
+
+def fit(lines: Sequence[str], limit: int = DESCRIPTION_LIMIT, separator: str = "\n") -> str:
+    """Join lines for an embed description, shortening the longest ones when the page would be too big."""
+    text = separator.join(lines)
+    if len(text) <= limit: return text
+
+    budget = limit // len(lines) - len(separator)
+    return separator.join(line if len(line) <= budget else line[:budget-1] + "…" for line in lines)
+
+class PageSource:
+    """Renders pages on demand and keeps the most recently viewed ones around.
+
+    Subclasses implement ``get_entries`` and may set ``max_pages`` when the
+    amount of pages is known up front, ``None`` means it is only known once
+    the last page has been reached.
+    """
+
+    def __init__(self, per_page: int, render: Renderer, cache_size: int = 10):
+        self.per_page = per_page
+        self.render = render
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[int, Embed]" = OrderedDict()
+        self.max_pages: Optional[int] = None
+
+    async def get_entries(self, index: int) -> List[Any]:
+        raise NotImplementedError
+
+    async def get_page(self, index: int) -> Optional[Embed]:
+        if index < 0 or (self.max_pages is not None and index >= self.max_pages): return None
+
+        if index in self.cache:
+            self.cache.move_to_end(index)
+            return self.cache[index]
+
+        entries = await self.get_entries(index)
+        if not entries: return None
+
+        embed = self.render(entries, index * self.per_page)
+        if asyncio.iscoroutine(embed): embed = await embed
+
+        self.cache[index] = embed
+        if len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+        return embed
+
+    def has_next(self, index: int) -> Optional[bool]:
+        """Whether a page follows ``index`` once it has been fetched, ``None`` when the source cannot tell."""
+        if self.max_pages is not None: return index + 1 < self.max_pages
+        return None
+
+class ListPageSource(PageSource):
+    def __init__(self, entries: Sequence[Any], per_page: int, render: Renderer, **kwargs):
+        super().__init__(per_page, render, **kwargs)
+        self.entries = entries
+        self.max_pages = max(1, -(-len(entries) // per_page))
+
+    async def get_entries(self, index: int) -> List[Any]:
+        start = index * self.per_page
+        return list(self.entries[start:start + self.per_page])
+
+class AsyncIteratorPageSource(PageSource):
+    """Pulls entries from an async iterable only as far as the furthest page viewed."""
+
+    def __init__(self, iterator: AsyncIterable[Any], per_page: int, render: Renderer, **kwargs):
+        super().__init__(per_page, render, **kwargs)
+        self.iterator = iterator.__aiter__()
+        self.entries: List[Any] = []
+        self.lock = asyncio.Lock()
+
+    def has_next(self, index: int) -> Optional[bool]:
+        if self.max_pages is not None: return index + 1 < self.max_pages
+        return True if len(self.entries) > (index + 1) * self.per_page else None
+
+    async def get_entries(self, index: int) -> List[Any]:
+        start = index * self.per_page
+        end = start + self.per_page
+
+        async with self.lock:
+            # read one entry past the page so we know whether another page follows
+            while self.max_pages is None and len(self.entries) <= end:
+                try: self.entries.append(await self.iterator.__anext__())
+                except StopAsyncIteration:
+                    self.max_pages = max(1, -(-len(self.entries) // self.per_page))
+
+        return self.entries[start:end]
+
+class EmbedPageSource(PageSource):
+    """Wraps a list of already built embeds."""
+
+    def __init__(self, embeds: Sequence[Embed]):
+        super().__init__(1, lambda entries, _: entries[0], cache_size=0)
+        self.embeds = embeds
+        self.max_pages = len(embeds)
+
+    async def get_entries(self, index: int) -> List[Any]:
+        return list(self.embeds[index:index + 1])
+
+    async def get_page(self, index: int) -> Optional[Embed]:
+        if 0 <= index < len(self.embeds): return self.embeds[index]
+        return None
+
+class KeysetPageSource(PageSource):
+    """Pages through a query with keyset (seek) pagination.
+
+    ``fetch(cursor, limit)`` returns at most ``limit`` rows that come after
+    ``cursor``, or the first rows when ``cursor`` is ``None``. Only the
+    cursor of every page reached so far is remembered, so the cost of a page
+    does not depend on how deep into the results it is.
+    """
+
+    def __init__(self, fetch: Callable[[Optional[tuple], int], Awaitable[List[Any]]], key: Callable[[Any], tuple], per_page: int, render: Renderer, **kwargs):
+        super().__init__(per_page, render, **kwargs)
+        self.fetch = fetch
+        self.key = key
+        self.cursors: List[Optional[tuple]] = [None]
+        self.lock = asyncio.Lock()
+
+    def has_next(self, index: int) -> Optional[bool]:
+        # the lookahead row of a fetched page already told whether another one follows
+        if self.max_pages is not None: return index + 1 < self.max_pages
+        return True if len(self.cursors) > index + 1 else None
+
+    async def get_entries(self, index: int) -> List[Any]:
+        async with self.lock:
+            while len(self.cursors) <= index:
+                if self.max_pages is not None: return []
+                await self.fetch_page(len(self.cursors) - 1)
+
+            return await self.fetch_page(index)
+
+    async def fetch_page(self, index: int) -> List[Any]:
+        rows = await self.fetch(self.cursors[index], self.per_page + 1)
+        if len(rows) <= self.per_page: self.max_pages = max(1, index + 1)
+        elif len(self.cursors) == index + 1: self.cursors.append(self.key(rows[self.per_page - 1]))
+        return list(rows[:self.per_page])
+
+class RangePageSource(PageSource):
+    """Pages through a store that can read any slice directly, such as a Redis sorted set.
+
+    ``fetch(start, limit)`` returns the entries from position ``start`` and
+    ``total`` is the amount of entries.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], Awaitable[List[Any]]], total: int, per_page: int, render: Renderer, **kwargs):
+        super().__init__(per_page, render, **kwargs)
+        self.fetch = fetch
+        self.max_pages = max(1, -(-total // per_page))
+
+    async def get_entries(self, index: int) -> List[Any]:
+        return list(await self.fetch(index * self.per_page, self.per_page))
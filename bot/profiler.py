@@ -0,0 +1,111 @@
+import re, time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+
+# qualified name of the command being invoked, set by Pride.invoke
+command: ContextVar[Optional[str]] = ContextVar("command", default=None)
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![$\w])\d+\b")
+WHITESPACE = re.compile(r"\s+")
+
+class QueryStats:
+    __slots__ = ("calls", "total", "max", "rows", "wait")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.wait = 0.0
+
+class ProfiledPool:
+    """Wraps an ``asyncpg.Pool`` and keeps timings per normalized statement.
+
+    Records calls, time spent running, the slowest run, rows returned and
+    time spent waiting for a connection. Statements slower than ``slow``
+    seconds are printed along with the command that ran them. Anything not
+    profiled here is passed through to the pool.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, slow: float = 0.1, max_statements: int = 1000):
+        self.pool = pool
+        self.slow = slow
+        self.max_statements = max_statements
+        self.stats: Dict[str, QueryStats] = {}
+        self.normalized: Dict[str, str] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+    def normalize(self, query: str) -> str:
+        normalized = self.normalized.get(query)
+        if normalized is None:
+            normalized = WHITESPACE.sub(" ", LITERALS.sub("?", query)).strip()
+            if len(self.normalized) < self.max_statements: self.normalized[query] = normalized
+        return normalized
+
+    def record(self, query: str, elapsed: float, wait: float, rows: int) -> None:
+        key = self.normalize(query)
+        stats = self.stats.get(key)
+        if stats is None:
+            if len(self.stats) >= self.max_statements: key = "<other>"
+            stats = self.stats.setdefault(key, QueryStats())
+
+        stats.calls += 1
+        stats.total += elapsed
+        stats.wait += wait
+        stats.rows += rows
+        if elapsed > stats.max: stats.max = elapsed
+
+        if elapsed >= self.slow: print(f"Slow query ({elapsed * 1000:.0f}ms) in {command.get() or 'no command'}: {key}")
+
+    async def run(self, method: str, query: str, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        async with self.pool.acquire() as connection:
+            acquired = time.perf_counter()
+            result = await getattr(connection, method)(query, *args, **kwargs)
+        elapsed = time.perf_counter() - acquired
+
+        if isinstance(result, list): rows = len(result)
+        elif result is None or isinstance(result, str): rows = 0
+        else: rows = 1
+        self.record(query, elapsed, acquired - start, rows)
+        return result
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        return await self.run("execute", query, *args, **kwargs)
+
+    async def executemany(self, query: str, args, **kwargs) -> None:
+        return await self.run("executemany", query, args, **kwargs)
+
+    async def fetch(self, query: str, *args, **kwargs) -> List[asyncpg.Record]:
+        return await self.run("fetch", query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[asyncpg.Record]:
+        return await self.run("fetchrow", query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        return await self.run("fetchval", query, *args, **kwargs)
+
+    async def copy_records_to_table(self, table_name: str, **kwargs) -> str:
+        return await self.run("copy_records_to_table", table_name, **kwargs)
+
+    @asynccontextmanager
+    async def acquire(self, **kwargs):
+        """Connections held directly are timed as a whole under ``<acquire>``."""
+        start = time.perf_counter()
+        async with self.pool.acquire(**kwargs) as connection:
+            acquired = time.perf_counter()
+            try:
+                yield connection
+            finally:
+                self.record("<acquire>", time.perf_counter() - acquired, acquired - start, 0)
+
+    def top(self, limit: int = 10, key: str = "total") -> List[Tuple[str, QueryStats]]:
+        return sorted(self.stats.items(), key=lambda item: getattr(item[1], key), reverse=True)[:limit]
+
+    def reset(self) -> None:
+        self.stats.clear()
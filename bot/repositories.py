@@ -0,0 +1,51 @@
+from typing import Optional, Tuple
+
+import asyncpg
+from discord.ext import commands
+
+class Repository:
+    """Typed access to one of the hot tables.
+
+    Every statement is a constant string selecting explicit columns, so
+    asyncpg prepares it once per connection and reuses the plan from its
+    statement cache afterwards. ``timeout`` bounds each call.
+    """
+
+    def __init__(self, bot: commands.Bot, timeout: float = 2.0):
+        self.bot = bot
+        self.timeout = timeout
+
+class Prefixes(Repository):
+    GET = "SELECT (SELECT prefix FROM prefixes WHERE guild_id = $1 LIMIT 1) AS guild, (SELECT prefix FROM selfprefix WHERE user_id = $2 LIMIT 1) AS self"
+    UPDATE = "UPDATE prefixes SET prefix = $2 WHERE guild_id = $1"
+    INSERT = "INSERT INTO prefixes (guild_id, prefix) VALUES ($1, $2)"
+
+    async def get(self, guild_id: int, user_id: int) -> Tuple[Optional[str], Optional[str]]:
+        """The guild prefix and the user's own prefix, in one round trip."""
+        row = await self.bot.db.fetchrow(self.GET, guild_id, user_id, timeout=self.timeout)
+        return (row["guild"], row["self"]) if row else (None, None)
+
+    async def set(self, guild_id: int, prefix: str) -> None:
+        async with self.bot.db.acquire() as connection:
+            async with connection.transaction():
+                if await connection.execute(self.UPDATE, guild_id, prefix, timeout=self.timeout) == "UPDATE 0":
+                    await connection.execute(self.INSERT, guild_id, prefix, timeout=self.timeout)
+
+class Reskin(Repository):
+    GET = "SELECT name, avatar FROM reskin WHERE user_id = $1 AND toggled LIMIT 1"
+
+    async def get(self, user_id: int) -> Optional[asyncpg.Record]:
+        """The user's reskin if they have it toggled on."""
+        return await self.bot.db.fetchrow(self.GET, user_id, timeout=self.timeout)
+
+class Hardbans(Repository):
+    EXISTS = "SELECT EXISTS (SELECT 1 FROM hardban WHERE guild_id = $1 AND user_id = $2)"
+
+    async def exists(self, guild_id: int, user_id: int) -> bool:
+        return await self.bot.db.fetchval(self.EXISTS, guild_id, user_id, timeout=self.timeout)
+
+class Repositories:
+    def __init__(self, bot: commands.Bot):
+        self.prefixes = Prefixes(bot)
+        self.reskin = Reskin(bot)
+        self.hardbans = Hardbans(bot)
@@ -0,0 +1,189 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+import discord
+from discord.ext import commands
+
+WORD = re.compile(r"[a-z0-9]{3,}")
+
+def trigrams(text: str) -> Set[str]:
+    text = f"  {text} "
+    return {text[i:i+3] for i in range(len(text) - 2)}
+
+def distance(a: str, b: str) -> int:
+    """Edit distance counting a swap of two neighbouring characters as one edit."""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]: current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+class CommandIndex:
+    """Trigram index over command names, aliases and descriptions.
+
+    Built once after the cogs are loaded and rebuilt lazily whenever a cog is
+    added or removed, so a lookup only touches the postings of the query's
+    trigrams instead of comparing against every command.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.exact: Dict[str, commands.Command] = {}
+        self.names: Dict[int, str] = {}
+        self.terms: List[Tuple[commands.Command, int, float]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.stale = True
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+    def add_term(self, term: str, command: commands.Command, weight: float) -> None:
+        grams = trigrams(term)
+        term_id = len(self.terms)
+        self.terms.append((command, len(grams), weight))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(term_id)
+
+    def build(self) -> None:
+        self.exact.clear()
+        self.names.clear()
+        self.terms.clear()
+        self.postings.clear()
+
+        for command in self.bot.walk_commands():
+            if command.hidden: continue
+            names = {command.name, *command.aliases}
+            parent = command.full_parent_name
+            if parent: names |= {f"{parent} {name}" for name in set(names)}
+
+            for name in names:
+                name = name.lower()
+                self.exact.setdefault(name, command)
+                self.names[len(self.terms)] = name
+                self.add_term(name, command, 1.0)
+
+            for word in set(WORD.findall((command.description or "").lower())) - names:
+                self.add_term(word, command, 0.6)
+
+        self.stale = False
+
+    def search(self, query: str, limit: int = 3, cutoff: float = 0.35) -> List[Tuple[commands.Command, float]]:
+        """Return up to ``limit`` ``(command, score)`` pairs, best first."""
+        if self.stale: self.build()
+
+        query = query.lower().strip()
+        if query in self.exact: return [(self.exact[query], 1.0)]
+
+        grams = trigrams(query)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for term_id in self.postings.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+
+        best: Dict[commands.Command, float] = {}
+        for term_id, count in shared.items():
+            command, size, weight = self.terms[term_id]
+            score = weight * 2 * count / (len(grams) + size)
+            if score >= cutoff and score > best.get(command, 0):
+                best[command] = score
+
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def suggest(self, query: str, cutoff: float = 0.35) -> Optional[commands.Command]:
+        """The command ``query`` is most likely a typo of.
+
+        A typo in a short name leaves only a trigram or two in common, too few
+        for the trigram score, so every name sharing one is ranked by edit
+        distance first and the trigram search is the fallback.
+        """
+        if self.stale: self.build()
+        query = query.lower().strip()
+        if query in self.exact: return self.exact[query]
+
+        candidates = {self.names[term_id] for gram in trigrams(query) for term_id in self.postings.get(gram, ()) if term_id in self.names}
+        allowed = 1 if len(query) <= 4 else 2
+        ranked = sorted((distance(query, name), name) for name in candidates)
+        if ranked and ranked[0][0] <= allowed: return self.exact[ranked[0][1]]
+
+        results = self.search(query, limit=1, cutoff=cutoff)
+        return results[0][0] if results else None
+
+class GuildRoles:
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self.names: Dict[int, str] = {}
+        self.ordered: List[Tuple[str, int]] = []
+        for role in guild.roles: self.add(role)
+
+    def add(self, role: discord.Role) -> None:
+        if role.is_default(): return
+        name = role.name.casefold()
+        self.names[role.id] = name
+        insort(self.ordered, (name, role.id))
+
+    def remove(self, role_id: int) -> None:
+        name = self.names.pop(role_id, None)
+        if name is None: return
+        index = bisect_left(self.ordered, (name, role_id))
+        if index < len(self.ordered) and self.ordered[index] == (name, role_id): del self.ordered[index]
+
+    def search(self, query: str) -> List[Tuple[int, int, int]]:
+        query = query.casefold()
+        found = {}
+
+        # names sharing the query as a prefix sit next to each other in the sorted list
+        index = bisect_left(self.ordered, (query, 0))
+        while index < len(self.ordered) and self.ordered[index][0].startswith(query):
+            name, role_id = self.ordered[index]
+            found[role_id] = 0 if name == query else 1
+            index += 1
+
+        for role_id, name in self.names.items():
+            if role_id not in found and query in name: found[role_id] = 2
+
+        return [(tier, len(self.names[role_id]), role_id) for role_id, tier in found.items()]
+
+class RoleIndex:
+    """Per-guild casefolded role names for exact, prefix and substring lookups.
+
+    A guild is indexed the first time it is searched and kept up to date from
+    the role create, update and delete events afterwards.
+    """
+
+    def __init__(self):
+        self.guilds: Dict[int, GuildRoles] = {}
+
+    def get(self, guild: discord.Guild) -> GuildRoles:
+        roles = self.guilds.get(guild.id)
+        if roles is None: roles = self.guilds[guild.id] = GuildRoles(guild)
+        return roles
+
+    def add(self, role: discord.Role) -> None:
+        if role.guild.id in self.guilds: self.guilds[role.guild.id].add(role)
+
+    def remove(self, role: discord.Role) -> None:
+        if role.guild.id in self.guilds: self.guilds[role.guild.id].remove(role.id)
+
+    def update(self, before: discord.Role, after: discord.Role) -> None:
+        if before.name == after.name: return
+        self.remove(before)
+        self.add(after)
+
+    def drop(self, guild: discord.Guild) -> None:
+        self.guilds.pop(guild.id, None)
+
+    def search(self, guild: discord.Guild, query: str, limit: int = 5) -> List[discord.Role]:
+        """Roles matching ``query``, exact matches first, then prefixes, then substrings.
+
+        Within a tier shorter names rank first, then higher roles.
+        """
+        ranked = []
+        for tier, length, role_id in self.get(guild).search(query):
+            role = guild.get_role(role_id)
+            if role is not None: ranked.append((tier, length, -role.position, role))
+
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked[:limit]]
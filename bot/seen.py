@@ -0,0 +1,72 @@
+import asyncio, time
+from typing import Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+class SeenTracker:
+    """Coalesces ``seen`` and ``oldusernames`` writes from hot events.
+
+    ``touch`` only overwrites the member's entry in a dict, so however many
+    messages a member sends between flushes, one row is written for them.
+    Every ``interval`` seconds the dirty entries are copied into a temporary
+    staging table and merged into ``seen`` in the same transaction, and old
+    usernames recorded by ``rename`` are copied into ``oldusernames``.
+    """
+
+    STAGING = "CREATE TEMP TABLE IF NOT EXISTS seen_staging (guild_id BIGINT, user_id BIGINT, time INTEGER) ON COMMIT DELETE ROWS"
+    MERGE = """
+        INSERT INTO seen (guild_id, user_id, time)
+        SELECT guild_id, user_id, time FROM seen_staging
+        ON CONFLICT (guild_id, user_id) DO UPDATE SET time = GREATEST(seen.time, EXCLUDED.time)
+    """
+
+    def __init__(self, bot: commands.Bot, interval: float = 10.0):
+        self.bot = bot
+        self.interval = interval
+        self.dirty: Dict[Tuple[int, int], int] = {}
+        self.usernames: List[Tuple[str, str, int, int]] = []
+        self.lock = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+
+    def touch(self, guild_id: int, user_id: int) -> None:
+        self.dirty[(guild_id, user_id)] = int(time.time())
+
+    def rename(self, before: discord.User, after: discord.User) -> None:
+        if before.name != after.name or before.discriminator != after.discriminator:
+            self.usernames.append((before.name, before.discriminator, int(time.time()), before.id))
+
+    async def flush(self) -> None:
+        async with self.lock:
+            if not self.bot.db or not (self.dirty or self.usernames): return
+            dirty, self.dirty = self.dirty, {}
+            usernames, self.usernames = self.usernames, []
+
+            try:
+                async with self.bot.db.acquire() as conn:
+                    async with conn.transaction():
+                        if dirty:
+                            await conn.execute(self.STAGING)
+                            await conn.copy_records_to_table("seen_staging", records=[(guild_id, user_id, seen) for (guild_id, user_id), seen in dirty.items()])
+                            await conn.execute(self.MERGE)
+                        if usernames:
+                            await conn.copy_records_to_table("oldusernames", records=usernames, columns=["username", "discriminator", "time", "user_id"])
+            except Exception as e:
+                # InterfaceError (pool closing, connection lost) included, the batch is always put back
+                print(f"Failed to write {len(dirty)} seen entries and {len(usernames)} usernames: {e}")
+                # keep whatever is newer, entries touched since the swap win
+                for key, seen in dirty.items(): self.dirty.setdefault(key, seen)
+                self.usernames[:0] = usernames
+
+    async def flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try: await self.flush()
+            except Exception as e: print(f"Failed to flush seen entries: {e}")
+
+    def start(self) -> None:
+        if self.task is None: self.task = asyncio.create_task(self.flush_loop())
+
+    async def close(self) -> None:
+        if self.task: self.task.cancel()
+        await self.flush()
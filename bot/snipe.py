@@ -0,0 +1,73 @@
+import json, time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from discord.ext import commands
+
+DELETE, EDIT, REACTION = "snipe", "editsnipe", "reactionsnipe"
+
+class SnipeStore:
+    """The most recent deleted messages, edits and removed reactions per channel.
+
+    Each (kind, channel) keeps at most ``per_channel`` entries, newest first,
+    and the store as a whole at most ``max_entries``; when it is full the
+    channels sniped least recently are dropped. With Redis available every
+    push is mirrored to a capped list that expires after ``ttl`` seconds,
+    which is read back for channels not held in memory, e.g. after a restart.
+    """
+
+    def __init__(self, bot: commands.Bot, per_channel: int = 20, max_entries: int = 50_000, ttl: int = 7200):
+        self.bot = bot
+        self.per_channel = per_channel
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.channels: "OrderedDict[Tuple[str, int], Deque[Dict[str, Any]]]" = OrderedDict()
+        self.size = 0
+
+    def key(self, kind: str, channel_id: int) -> str:
+        return f"{kind}:{channel_id}"
+
+    async def push(self, kind: str, channel_id: int, entries: Iterable[Dict[str, Any]]) -> None:
+        entries = list(entries)
+        if not entries: return
+        for entry in entries: entry.setdefault("time", int(time.time()))
+
+        buffer = self.channels.get((kind, channel_id))
+        if buffer is None: buffer = self.channels[(kind, channel_id)] = deque(maxlen=self.per_channel)
+        else: self.channels.move_to_end((kind, channel_id))
+
+        before = len(buffer)
+        buffer.extendleft(entries)
+        self.size += len(buffer) - before
+        while self.size > self.max_entries:
+            _, evicted = self.channels.popitem(last=False)
+            self.size -= len(evicted)
+
+        if self.bot.redis:
+            key = self.key(kind, channel_id)
+            try:
+                async with self.bot.redis.pipeline(transaction=False) as pipe:
+                    pipe.lpush(key, *(json.dumps(entry) for entry in entries))
+                    pipe.ltrim(key, 0, self.per_channel - 1)
+                    pipe.expire(key, self.ttl)
+                    await pipe.execute()
+            except Exception as e:
+                print(f"Failed to mirror {kind} for {channel_id}: {e}")
+
+    async def get(self, kind: str, channel_id: int) -> List[Dict[str, Any]]:
+        """Entries newest first."""
+        buffer = self.channels.get((kind, channel_id))
+        if buffer is not None:
+            self.channels.move_to_end((kind, channel_id))
+            return list(buffer)
+
+        if self.bot.redis:
+            try: return [json.loads(entry) for entry in await self.bot.redis.lrange(self.key(kind, channel_id), 0, self.per_channel - 1)]
+            except Exception: pass
+        return []
+
+    async def clear(self, channel_id: int) -> None:
+        for kind in (DELETE, EDIT, REACTION):
+            buffer = self.channels.pop((kind, channel_id), None)
+            if buffer: self.size -= len(buffer)
+        if self.bot.redis: await self.bot.redis.delete(*(self.key(kind, channel_id) for kind in (DELETE, EDIT, REACTION)))
@@ -0,0 +1,165 @@
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+VARIABLE = re.compile(r"\{([a-z_]+(?:\.[a-z_]+)*)\}")
+PART = re.compile(r"\{\s*([a-z]+)\s*:\s*(.*)\}", re.S)
+
+def ordinal(number: int) -> str:
+    suffix = "th" if 10 <= number % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
+
+# variable -> value for the user a template is rendered for and the guild it is rendered in
+VARIABLES: Dict[str, Callable[[discord.abc.User, discord.Guild], str]] = {
+    "user": lambda user, guild: str(user),
+    "user.mention": lambda user, guild: user.mention,
+    "user.name": lambda user, guild: user.name,
+    "user.display_name": lambda user, guild: user.display_name,
+    "user.id": lambda user, guild: str(user.id),
+    "user.avatar": lambda user, guild: user.display_avatar.url,
+    "user.created_at": lambda user, guild: f"<t:{int(user.created_at.timestamp())}:R>",
+    "user.joined_at": lambda user, guild: f"<t:{int(user.joined_at.timestamp())}:R>" if getattr(user, "joined_at", None) else "",
+    "guild.name": lambda user, guild: guild.name,
+    "guild.id": lambda user, guild: str(guild.id),
+    "guild.count": lambda user, guild: str(guild.member_count),
+    "guild.count.format": lambda user, guild: ordinal(guild.member_count or 0),
+    "guild.icon": lambda user, guild: guild.icon.url if guild.icon else "",
+    "guild.boost_count": lambda user, guild: str(guild.premium_subscription_count),
+    "guild.booster_count": lambda user, guild: str(len(guild.premium_subscribers)),
+}
+
+def moderation(moderator: discord.abc.User, reason: str) -> Dict[str, str]:
+    """Extra variables for the ``invoke`` and ``dm`` templates of moderation commands."""
+    return {
+        "moderator": str(moderator),
+        "moderator.mention": moderator.mention,
+        "moderator.name": moderator.name,
+        "moderator.id": str(moderator.id),
+        "moderator.avatar": moderator.display_avatar.url,
+        "reason": reason,
+    }
+
+class Text:
+    """A template string compiled to a ``str.format`` pattern over its variables."""
+
+    __slots__ = ("pattern", "names")
+
+    def __init__(self, source: str, names: Dict[str, int]):
+        pieces = VARIABLE.split(source)
+        # literal text sits at even indices, variable names at odd ones
+        for i in range(1, len(pieces), 2): pieces[i] = "{%d}" % names.setdefault(pieces[i], len(names))
+        for i in range(0, len(pieces), 2): pieces[i] = pieces[i].replace("{", "{{").replace("}", "}}")
+        self.pattern = "".join(pieces)
+        self.names = names
+
+    def __call__(self, values: List[str]) -> str:
+        return self.pattern.format(*values)
+
+class Template:
+    """A stored message or embed template parsed into a render plan.
+
+    Plain templates are sent as message content. Templates starting with
+    ``{embed}`` are embed scripts: ``$v`` separated ``{key: value}`` parts,
+    where author, footer and field values split their parts on ``&&``.
+    Every text is compiled once, rendering looks each variable up once and
+    formats the precompiled patterns.
+    """
+
+    def __init__(self, source: str):
+        self.names: Dict[str, int] = {}
+        self.content: Optional[Text] = None
+        self.embed: Dict[str, Text] = {}
+        self.author: List[Text] = []
+        self.footer: List[Text] = []
+        self.fields: List[Tuple[Text, Text, bool]] = []
+        self.color: Optional[int] = None
+        self.timestamp = False
+        self.is_embed = source.startswith("{embed}")
+
+        if not self.is_embed:
+            self.content = self.text(source)
+            return
+
+        for part in source[len("{embed}"):].split("$v"):
+            match = PART.fullmatch(part.strip())
+            if not match: continue
+            key, value = match.group(1), match.group(2).strip()
+
+            if key in ("content", "message"): self.content = self.text(value)
+            elif key in ("title", "description", "url", "thumbnail", "image"): self.embed[key] = self.text(value)
+            elif key == "author": self.author = [self.text(piece.strip()) for piece in value.split("&&")][:3]
+            elif key == "footer": self.footer = [self.text(piece.strip()) for piece in value.split("&&")][:2]
+            elif key == "field":
+                pieces = [piece.strip() for piece in value.split("&&")]
+                if len(pieces) >= 2: self.fields.append((self.text(pieces[0]), self.text(pieces[1]), len(pieces) > 2 and pieces[2] == "inline"))
+            elif key == "color":
+                try: self.color = int(value.lstrip("#"), 16)
+                except ValueError: pass
+            elif key == "timestamp": self.timestamp = True
+
+    def text(self, source: str) -> Text:
+        return Text(source, self.names)
+
+    def values(self, user: discord.abc.User, guild: discord.Guild, extra: Optional[Dict[str, str]] = None) -> List[str]:
+        values = []
+        for name in self.names:
+            if extra and name in extra: values.append(extra[name])
+            elif name in VARIABLES: values.append(VARIABLES[name](user, guild))
+            else: values.append("{%s}" % name)
+        return values
+
+    def render(self, member: discord.abc.User, extra: Optional[Dict[str, str]] = None, guild: Optional[discord.Guild] = None) -> dict:
+        """Keyword arguments for ``send``, with the variables filled in for ``member``.
+
+        ``guild`` is only needed when ``member`` is a user who is not in it.
+        """
+        values = self.values(member, guild or member.guild, extra)
+        result = {"content": self.content(values)[:2000] if self.content else None}
+        if not self.is_embed: return result
+
+        embed = discord.Embed(color=self.color, **{key: text(values) for key, text in self.embed.items() if key in ("title", "description", "url")})
+        if "thumbnail" in self.embed: embed.set_thumbnail(url=self.embed["thumbnail"](values) or None)
+        if "image" in self.embed: embed.set_image(url=self.embed["image"](values) or None)
+        if self.author:
+            author = [text(values) for text in self.author] + [None, None]
+            embed.set_author(name=author[0], icon_url=author[1] or None, url=author[2] or None)
+        if self.footer:
+            footer = [text(values) for text in self.footer] + [None]
+            embed.set_footer(text=footer[0], icon_url=footer[1] or None)
+        for name, value, inline in self.fields[:25]: embed.add_field(name=name(values), value=value(values), inline=inline)
+        if self.timestamp: embed.timestamp = discord.utils.utcnow()
+
+        result["embed"] = embed
+        return result
+
+class Templates:
+    """Compiled templates shared by every feature that sends stored messages.
+
+    Plans are kept for the ``max_templates`` most recently used templates,
+    keyed by guild and template hash, so a template is parsed once and not
+    on every join, leave or moderation action that renders it.
+    """
+
+    def __init__(self, bot: commands.Bot, max_templates: int = 10_000):
+        self.bot = bot
+        self.max_templates = max_templates
+        self.plans: "OrderedDict[Tuple[int, int], Tuple[str, Template]]" = OrderedDict()
+
+    def get(self, guild_id: int, source: str) -> Template:
+        key = (guild_id, hash(source))
+        cached = self.plans.get(key)
+        if cached and cached[0] == source:
+            self.plans.move_to_end(key)
+            return cached[1]
+
+        template = Template(source)
+        self.plans[key] = (source, template)
+        while len(self.plans) > self.max_templates: self.plans.popitem(last=False)
+        return template
+
+    def render(self, member: discord.abc.User, source: str, extra: Optional[Dict[str, str]] = None, guild: Optional[discord.Guild] = None) -> dict:
+        guild = guild or member.guild
+        return self.get(guild.id, source).render(member, extra, guild)
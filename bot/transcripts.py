@@ -0,0 +1,58 @@
+import html
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+import discord
+import orjson
+
+HEADER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title><style>
+body {{ background: #313338; color: #dbdee1; font-family: sans-serif; font-size: 15px; }}
+.message {{ display: flex; gap: 12px; padding: 6px 16px; }}
+.message img {{ width: 40px; height: 40px; border-radius: 50%; }}
+.author {{ font-weight: 600; color: #f2f3f5; }}
+.time {{ color: #949ba4; font-size: 12px; margin-left: 6px; }}
+.content {{ white-space: pre-wrap; word-wrap: break-word; }}
+a {{ color: #00a8fc; }}
+</style></head><body><h2>{title}</h2>
+"""
+FOOTER = "<p>{count} messages</p></body></html>\n"
+
+def html_message(message: discord.Message) -> str:
+    content = html.escape(message.content)
+    attachments = "".join(f'<br><a href="{html.escape(attachment.url)}">{html.escape(attachment.filename)}</a>' for attachment in message.attachments)
+    embeds = "".join(f"<br><i>{html.escape(embed.title or embed.description or 'embed')}</i>" for embed in message.embeds)
+    return (
+        f'<div class="message"><img src="{html.escape(message.author.display_avatar.url)}"><div>'
+        f'<span class="author">{html.escape(str(message.author))}</span><span class="time">{message.created_at:%Y-%m-%d %H:%M:%S} UTC</span>'
+        f'<div class="content">{content}{attachments}{embeds}</div></div></div>\n'
+    )
+
+def json_message(message: discord.Message) -> bytes:
+    return orjson.dumps({
+        "id": message.id,
+        "author": {"id": message.author.id, "name": str(message.author)},
+        "created_at": message.created_at.isoformat(),
+        "content": message.content,
+        "attachments": [attachment.url for attachment in message.attachments],
+        "embeds": [embed.to_dict() for embed in message.embeds],
+    }) + b"\n"
+
+async def export(channel: discord.TextChannel, format: str = "html", max_size: int = 8 * 1024 * 1024) -> IO[bytes]:
+    """Write the channel's history, oldest first, to a file positioned at its start.
+
+    History is paged through and every message is written as it arrives, so
+    only one page of messages is held at a time. The file stays in memory up
+    to ``max_size`` bytes and is moved to disk past that.
+    """
+    file = SpooledTemporaryFile(max_size=max_size)
+    count = 0
+    if format == "html": file.write(HEADER.format(title=html.escape(f"#{channel.name}")).encode())
+
+    async for message in channel.history(limit=None, oldest_first=True):
+        file.write(html_message(message).encode() if format == "html" else json_message(message))
+        count += 1
+
+    if format == "html": file.write(FOOTER.format(count=count).encode())
+    file.seek(0)
+    return file
@@ -0,0 +1,153 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from discord.ext import commands
+
+from bot.guildconfig import GuildConfig
+
+# no optional scheme in front, so the regex engine can skip ahead to "d" instead of trying every position
+INVITE = re.compile(r"(?:discord(?:app)?\.com/invite|discord\.(?:gg|io|me|li)|dsc\.gg)/[\w-]+", re.I)
+
+FILTER, REACT, RESPONSE = "chatfilter", "autoreact", "autoresponses"
+
+def wordchar(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+class Automaton:
+    """Aho-Corasick automaton matching every pattern in one pass over the text.
+
+    ``patterns`` are (pattern, value) pairs, matched case insensitively as
+    whole words: a pattern starting or ending in a word character only
+    counts when the text next to it is not one, so "ass" is not found in
+    "class". ``search`` returns the ids of the patterns found, in the order
+    the patterns were given.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, object]]):
+        self.values: List[object] = []
+        # per pattern: its length, and whether its first and last characters need a word boundary
+        self.bounds: List[Tuple[int, bool, bool]] = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple[int, ...]] = [()]
+
+        for pattern, value in patterns:
+            pattern = pattern.casefold()
+            if not pattern: continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = next_state
+            self.out[state] += (len(self.values),)
+            self.values.append(value)
+            self.bounds.append((len(pattern), wordchar(pattern[0]), wordchar(pattern[-1])))
+
+        # breadth first, so a state's failure target is final before its children need it
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]: fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.out[child] += self.out[self.fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def search(self, text: str) -> List[int]:
+        goto, fail, out, bounds = self.goto, self.fail, self.out, self.bounds
+        found: Set[int] = set()
+        state = 0
+        text = text.casefold()
+        for end, char in enumerate(text):
+            while state and char not in goto[state]: state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]: continue
+            after = end + 1 < len(text) and wordchar(text[end + 1])
+            for pattern_id in out[state]:
+                if pattern_id in found: continue
+                length, starts, ends = bounds[pattern_id]
+                before = end - length
+                if starts and before >= 0 and wordchar(text[before]): continue
+                if ends and after: continue
+                found.add(pattern_id)
+        return sorted(found)
+
+class Matches:
+    __slots__ = ("filtered", "reactions", "responses", "invite")
+
+    def __init__(self):
+        self.filtered: List[str] = []
+        self.reactions: List[str] = []
+        self.responses: List[str] = []
+        self.invite = False
+
+    def __bool__(self) -> bool:
+        return bool(self.filtered or self.reactions or self.responses or self.invite)
+
+def emojis(value: str) -> List[str]:
+    """Autoreact emojis are stored either as a JSON list or separated by spaces."""
+    try:
+        parsed = orjson.loads(value)
+        if isinstance(parsed, list): return [str(emoji) for emoji in parsed]
+    except orjson.JSONDecodeError:
+        pass
+    return value.split()
+
+class GuildTriggers:
+    """The chat filter, autoreacts, autoresponses and invite filter of one guild, compiled together."""
+
+    def __init__(self, config: GuildConfig):
+        self.config = config
+        self.antiinvite = config.enabled("antiinvite")
+        self.automaton = Automaton(
+            [(row["word"], (FILTER, row["word"])) for row in config.chatfilter if row["word"]]
+            + [(row["trigger"], (REACT, emojis(row["emojis"] or ""))) for row in config.autoreact if row["trigger"]]
+            + [(row["key"], (RESPONSE, row["response"])) for row in config.autoresponses if row["key"]]
+        )
+
+    def match(self, content: str) -> Matches:
+        matches = Matches()
+        if self.automaton.values:
+            for pattern_id in self.automaton.search(content):
+                kind, value = self.automaton.values[pattern_id]
+                if kind == FILTER: matches.filtered.append(value)
+                elif kind == REACT: matches.reactions.extend(value)
+                else: matches.responses.append(value)
+        if self.antiinvite: matches.invite = INVITE.search(content) is not None
+        return matches
+
+class TriggerEngine:
+    """Compiled triggers per guild, built from the guild's ``GuildConfig``.
+
+    A guild is recompiled only when its config snapshot has been replaced,
+    which happens after ``GuildConfigCache.invalidate`` for that guild, so
+    every other guild keeps its automaton.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.guilds: Dict[int, GuildTriggers] = {}
+
+    async def get(self, guild_id: int) -> GuildTriggers:
+        config = await self.bot.guild_config.get(guild_id)
+        triggers = self.guilds.get(guild_id)
+        if triggers is None or triggers.config is not config:
+            triggers = self.guilds[guild_id] = GuildTriggers(config)
+        return triggers
+
+    async def match(self, guild_id: int, content: str) -> Optional[Matches]:
+        if not content: return None
+        return (await self.get(guild_id)).match(content)
+
+    def drop(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
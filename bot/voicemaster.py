@@ -0,0 +1,155 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+import asyncpg
+import discord
+from discord.ext import commands
+
+# name of the hidden channels waiting in a guild's pool, so they are found again after a restart
+SPARE = "vm-spare"
+
+class VoiceMaster:
+    """Join to create voice channels handed out from a pool of pre-created ones.
+
+    Every guild keeps up to ``pool_size`` hidden channels next to its join
+    channel. Claiming one is a single edit (name and overwrites) followed by
+    the move, the pool is refilled in the background afterwards. Channels
+    that empty out are collected and reaped every ``interval`` seconds:
+    up to the pool size they are hidden and put back in the pool, the rest
+    are deleted, and their ``vcs`` rows go in one statement.
+    """
+
+    def __init__(self, bot: commands.Bot, pool_size: int = 2, interval: float = 30.0):
+        self.bot = bot
+        self.pool_size = pool_size
+        self.interval = interval
+        self.pools: Dict[int, Deque[int]] = {}
+        self.owners: Dict[int, int] = {}
+        self.empty: Set[int] = set()
+        self.refilling: Set[int] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        try:
+            for row in await self.bot.db.fetch("SELECT user_id, voice FROM vcs"): self.owners[row["voice"]] = row["user_id"]
+        except (asyncpg.PostgresError, OSError) as e:
+            print(f"Failed to load voicemaster channels: {e}")
+        # channels that emptied while the bot was offline are reaped on the first pass
+        self.empty.update(self.owners)
+        if self.task is None: self.task = asyncio.create_task(self.reap_loop())
+
+    def stop(self) -> None:
+        if self.task: self.task.cancel()
+
+    async def settings(self, guild: discord.Guild) -> Optional[discord.VoiceChannel]:
+        config = await self.bot.guild_config.get(guild.id)
+        setup = config.first("voicemaster")
+        channel = guild.get_channel(setup["channel_id"] or 0) if setup else None
+        return channel if isinstance(channel, discord.VoiceChannel) else None
+
+    def hidden(self, guild: discord.Guild) -> Dict[discord.abc.Snowflake, discord.PermissionOverwrite]:
+        return {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False, connect=False),
+            guild.me: discord.PermissionOverwrite(view_channel=True, connect=True, manage_channels=True, move_members=True),
+        }
+
+    def pool(self, guild: discord.Guild, join: discord.VoiceChannel) -> Deque[int]:
+        pool = self.pools.get(guild.id)
+        if pool is None:
+            siblings = join.category.voice_channels if join.category else guild.voice_channels
+            pool = self.pools[guild.id] = deque(channel.id for channel in siblings if channel.name == SPARE and channel.id not in self.owners)
+        return pool
+
+    async def refill(self, guild: discord.Guild, join: discord.VoiceChannel) -> None:
+        if guild.id in self.refilling: return
+        self.refilling.add(guild.id)
+        try:
+            pool = self.pool(guild, join)
+            while len(pool) < self.pool_size:
+                channel = await guild.create_voice_channel(SPARE, category=join.category, overwrites=self.hidden(guild), reason="VoiceMaster pool")
+                pool.append(channel.id)
+        except discord.HTTPException as e:
+            print(f"Failed to refill the voicemaster pool of {guild.id}: {e}")
+        finally:
+            self.refilling.discard(guild.id)
+
+    async def claim(self, member: discord.Member, join: discord.VoiceChannel) -> None:
+        guild = member.guild
+        pool = self.pool(guild, join)
+        overwrites = {**join.overwrites, guild.me: self.hidden(guild)[guild.me], member: discord.PermissionOverwrite(view_channel=True, connect=True, manage_channels=True, move_members=True)}
+        name = f"{member.display_name}'s channel"[:100]
+
+        channel = None
+        while pool and channel is None:
+            channel = guild.get_channel(pool.popleft())
+        try:
+            if channel: await channel.edit(name=name, overwrites=overwrites, reason="VoiceMaster claim")
+            else: channel = await guild.create_voice_channel(name, category=join.category, overwrites=overwrites, reason="VoiceMaster claim")
+            await member.move_to(channel)
+        except discord.HTTPException as e:
+            print(f"Failed to create a voice channel for {member.id}: {e}")
+            if channel: self.empty.add(channel.id)
+            return
+        finally:
+            asyncio.ensure_future(self.refill(guild, join))
+
+        self.owners[channel.id] = member.id
+        await self.bot.db.execute("INSERT INTO vcs (user_id, voice) VALUES ($1, $2)", member.id, channel.id)
+
+    async def handle(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState) -> None:
+        if before.channel == after.channel: return
+        if before.channel and before.channel.id in self.owners and not before.channel.members: self.empty.add(before.channel.id)
+        if after.channel and after.channel.id in self.empty: self.empty.discard(after.channel.id)
+
+        if after.channel and not member.bot:
+            join = await self.settings(member.guild)
+            if join and after.channel.id == join.id: await self.claim(member, join)
+
+    async def transfer(self, channel: discord.VoiceChannel, member: discord.Member) -> None:
+        previous = channel.guild.get_member(self.owners.get(channel.id, 0))
+        overwrites = {**channel.overwrites, member: discord.PermissionOverwrite(view_channel=True, connect=True, manage_channels=True, move_members=True)}
+        if previous: overwrites.pop(previous, None)
+        await channel.edit(overwrites=overwrites, reason="VoiceMaster claim")
+        self.owners[channel.id] = member.id
+        await self.bot.db.execute("UPDATE vcs SET user_id = $1 WHERE voice = $2", member.id, channel.id)
+
+    async def reap(self) -> None:
+        empty, self.empty = self.empty, set()
+        recycle: List[discord.VoiceChannel] = []
+        delete: List[discord.abc.GuildChannel] = []
+        gone: List[int] = []
+
+        for channel_id in empty:
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                if self.bot.is_ready(): gone.append(channel_id)
+                else: self.empty.add(channel_id)
+                continue
+            if channel.members: continue
+            gone.append(channel_id)
+            join = await self.settings(channel.guild)
+            pool = self.pool(channel.guild, join) if join else None
+            if pool is not None and channel.category == join.category and len(pool) + sum(c.guild == channel.guild for c in recycle) < self.pool_size: recycle.append(channel)
+            else: delete.append(channel)
+
+        if not gone: return
+        for channel_id in gone: self.owners.pop(channel_id, None)
+        await self.bot.db.execute("DELETE FROM vcs WHERE voice = ANY($1::bigint[])", gone)
+
+        async def back_to_pool(channel: discord.VoiceChannel):
+            await channel.edit(name=SPARE, overwrites=self.hidden(channel.guild), reason="VoiceMaster pool")
+            self.pools[channel.guild.id].append(channel.id)
+
+        results = await asyncio.gather(*(back_to_pool(channel) for channel in recycle), *(channel.delete(reason="VoiceMaster channel empty") for channel in delete), return_exceptions=True)
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed: print(f"Failed to reap {len(failed)} voicemaster channels: {failed[0]}")
+
+    async def reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try: await self.reap()
+            except Exception as e: print(f"Failed to reap voicemaster channels: {e}")
+
+    def drop(self, guild_id: int) -> None:
+        self.pools.pop(guild_id, None)
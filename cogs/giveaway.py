@@ -1,10 +1,244 @@
 import discord
 from discord.ext import commands
 from discord.ui import View
+from datetime import timedelta
+from typing import List, Sequence
+import asyncio, json, random, re
+
+ACTIVE = "giveaways"
+
+def entrants(message_id: int) -> str:
+    return f"giveaway:{message_id}"
 
 class GiveawayView(View):
+    """Entrants are kept in a Redis set per giveaway, so joining is a single idempotent SADD."""
+
     def __init__(self):
         super().__init__(timeout=None)
 
+    @discord.ui.button(emoji="🎉", style=discord.ButtonStyle.blurple, custom_id="giveaway:join")
+    async def join(self, interaction: discord.Interaction, button: discord.ui.Button):
+        redis = interaction.client.redis
+        if not redis:
+            return await interaction.response.send_message("Giveaways are unavailable right now", ephemeral=True)
+
+        if not await redis.sismember(ACTIVE, interaction.message.id):
+            return await interaction.response.send_message("This giveaway has ended", ephemeral=True)
+
+        if await redis.sadd(entrants(interaction.message.id), interaction.user.id):
+            await interaction.response.send_message("You entered the giveaway", ephemeral=True)
+        else:
+            await interaction.response.send_message("You already entered this giveaway", ephemeral=True)
+
+class Giveaway(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.color = 0xFFFFFF
+        self.interval = 15
+        self.keep = 7 * 86400
+        self.task = None
+
+    async def cog_load(self):
+        self.task = asyncio.create_task(self.end_loop())
+
+    async def cog_unload(self):
+        if self.task: self.task.cancel()
+
+    async def draw(self, guild: discord.Guild, message_id: int, count: int, exclude: Sequence[int] = ()) -> List[int]:
+        """Pick ``count`` distinct entrants still in the server, uniformly at random.
+
+        Candidates are sampled with SRANDMEMBER, a few times ``count`` at a
+        time, doubling the sample until enough winners are found or every
+        entrant has been seen, so the entrant set is only loaded whole when
+        most of it is ineligible.
+        """
+        key = entrants(message_id)
+        total = await self.bot.redis.scard(key)
+        size = count * 3 + len(exclude)
+        seen = set()
+        winners = []
+        while len(winners) < count and len(seen) < total:
+            candidates = await self.bot.redis.srandmember(key, size)
+            random.shuffle(candidates)
+            for member_id in map(int, candidates):
+                if member_id in seen: continue
+                seen.add(member_id)
+                if member_id not in exclude and guild and guild.get_member(member_id): winners.append(member_id)
+            if len(candidates) >= total: break
+            size *= 2
+        return winners[:count]
+
+    async def announce(self, row, winners: List[int], total: int):
+        channel = self.bot.get_channel(row['channel_id'])
+        if not channel: return
+
+        mentions = ", ".join(f"<@{winner}>" for winner in winners) or "nobody"
+        embed = discord.Embed(color=self.color, title=row['title'], description=f"Ended <t:{int(discord.utils.utcnow().timestamp())}:R>\nHosted by <@{row['host']}>\n**{total}** entries\nWinners: {mentions}")
+        try:
+            await channel.get_partial_message(row['message_id']).edit(embed=embed, view=None)
+            await channel.send(f"🎉 {mentions} won **{row['title']}**!" if winners else f"Nobody entered **{row['title']}**", reference=discord.MessageReference(message_id=row['message_id'], channel_id=row['channel_id'], fail_if_not_exists=False))
+        except discord.HTTPException:
+            pass
+
+    async def end(self, rows) -> int:
+        """End giveaways, archiving them to ``gw_ended`` together before any winner is announced.
+
+        A giveaway whose draw fails stays in ``giveaway`` for the next pass,
+        the others are archived in one transaction and only then announced,
+        so a failure never announces the same giveaway twice. Returns how
+        many giveaways were ended.
+        """
+        if not rows: return 0
+
+        async def finish(row):
+            winners = await self.draw(self.bot.get_guild(row['guild_id']), row['message_id'], row['winners'])
+            total = await self.bot.redis.scard(entrants(row['message_id']))
+            return row, winners, total
+
+        drawn = []
+        for row, result in zip(rows, await asyncio.gather(*(finish(row) for row in rows), return_exceptions=True)):
+            if isinstance(result, Exception): print(f"Failed to draw giveaway {row['message_id']}: {result}")
+            else: drawn.append(result)
+        if not drawn: return 0
+
+        message_ids = [row['message_id'] for row, _, _ in drawn]
+        async with self.bot.db.acquire() as conn:
+            async with conn.transaction():
+                await conn.copy_records_to_table("gw_ended", records=[(row['channel_id'], row['message_id'], json.dumps(winners)) for row, winners, _ in drawn], columns=["channel_id", "message_id", "members"])
+                await conn.execute("DELETE FROM giveaway WHERE message_id = ANY($1::bigint[])", message_ids)
+
+        # entrants stay around for a week so the giveaway can be rerolled
+        try:
+            async with self.bot.redis.pipeline(transaction=False) as pipe:
+                pipe.srem(ACTIVE, *message_ids)
+                for message_id in message_ids: pipe.expire(entrants(message_id), self.keep)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Failed to close {len(message_ids)} giveaways in Redis: {e}")
+
+        await asyncio.gather(*(self.announce(row, winners, total) for row, winners, total in drawn), return_exceptions=True)
+        return len(drawn)
+
+    async def end_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.bot.db or not self.bot.redis: continue
+            try:
+                await self.end(await self.bot.db.fetch("SELECT guild_id, channel_id, message_id, winners, finish, host, title FROM giveaway WHERE finish <= now() ORDER BY finish LIMIT 100"))
+            except Exception as e:
+                print(f"Failed to end giveaways: {e}")
+
+    @commands.group(
+        name="giveaway",
+        aliases=["gw"],
+        description="Giveaway commands",
+        invoke_without_command=True
+    )
+    async def giveaway(self, ctx):
+        """Giveaway commands"""
+        await ctx.send_help(ctx.command)
+
+    @giveaway.command(
+        name="start",
+        description="Start a giveaway in this channel",
+        usage="<duration> <winners> <prize>",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def giveaway_start(self, ctx, duration: str, winners: int, *, prize: str):
+        """Start a giveaway in this channel"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+        if not self.bot.redis:
+            return await ctx.warning("Redis not available")
+
+        units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+        matches = re.findall(r"(\d+)([smhdw])", duration)
+        seconds = sum(int(value) * units[unit] for value, unit in matches)
+        if not matches or seconds < 10 or seconds > 30 * 86400:
+            return await ctx.warning("Duration must be between 10 seconds and 30 days. Use: 30m, 2h, 1d")
+
+        if winners < 1 or winners > 50:
+            return await ctx.warning("You can pick between 1 and 50 winners")
+
+        finish = discord.utils.utcnow() + timedelta(seconds=seconds)
+        embed = discord.Embed(color=self.color, title=prize[:256], description=f"Ends <t:{int(finish.timestamp())}:R>\nHosted by {ctx.author.mention}\n**{winners}** winner{'s' if winners != 1 else ''}\nClick 🎉 to enter")
+        message = await ctx.channel.send(embed=embed, view=GiveawayView())
+
+        await self.bot.db.execute(
+            "INSERT INTO giveaway (guild_id, channel_id, message_id, winners, finish, host, title) VALUES ($1, $2, $3, $4, $5, $6, $7)",
+            ctx.guild.id, ctx.channel.id, message.id, winners, finish, ctx.author.id, prize[:256]
+        )
+        await self.bot.redis.sadd(ACTIVE, message.id)
+
+    @giveaway.command(
+        name="end",
+        description="End a giveaway now",
+        usage="<message id>",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def giveaway_end(self, ctx, message_id: int):
+        """End a giveaway now"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+        if not self.bot.redis:
+            return await ctx.warning("Redis not available")
+
+        row = await self.bot.db.fetchrow("SELECT guild_id, channel_id, message_id, winners, finish, host, title FROM giveaway WHERE guild_id = $1 AND message_id = $2", ctx.guild.id, message_id)
+        if not row:
+            return await ctx.warning("There is no active giveaway with that message id")
+
+        if not await self.end([row]):
+            return await ctx.warning("Could not draw the winners of that giveaway, try again")
+        await ctx.success(f"Ended **{row['title']}**")
+
+    @giveaway.command(
+        name="reroll",
+        description="Draw new winners for an ended giveaway",
+        usage="<message id> [winners]",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def giveaway_reroll(self, ctx, message_id: int, winners: int = 1):
+        """Draw new winners for an ended giveaway"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+        if not self.bot.redis:
+            return await ctx.warning("Redis not available")
+
+        row = await self.bot.db.fetchrow("SELECT members FROM gw_ended WHERE message_id = $1 AND channel_id = ANY($2::bigint[])", message_id, [channel.id for channel in ctx.guild.channels])
+        if not row:
+            return await ctx.warning("There is no ended giveaway with that message id")
+
+        if not await self.bot.redis.exists(entrants(message_id)):
+            return await ctx.warning("The entries of that giveaway have expired")
+
+        previous = json.loads(row['members'] or "[]")
+        drawn = await self.draw(ctx.guild, message_id, max(1, min(winners, 50)), exclude=previous)
+        if not drawn:
+            return await ctx.warning("There is nobody left to draw")
+
+        await ctx.reply(f"🎉 New winner{'s' if len(drawn) != 1 else ''}: {', '.join(f'<@{winner}>' for winner in drawn)}")
+
+    @giveaway.command(
+        name="list",
+        description="Show the active giveaways in this server",
+        brief="none"
+    )
+    async def giveaway_list(self, ctx):
+        """Show the active giveaways in this server"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        rows = await self.bot.db.fetch("SELECT channel_id, message_id, finish, title FROM giveaway WHERE guild_id = $1 ORDER BY finish", ctx.guild.id)
+        if not rows:
+            return await ctx.warning("There are no active giveaways")
+
+        await ctx.index(
+            [f"[{row['title']}](https://discord.com/channels/{ctx.guild.id}/{row['channel_id']}/{row['message_id']}) ends <t:{int(row['finish'].timestamp())}:R>" for row in rows],
+            "Giveaways", {'name': ctx.author.name, 'icon_url': ctx.author.display_avatar.url}
+        )
+
 async def setup(bot: commands.Bot):
-    pass
+    await bot.add_cog(Giveaway(bot))
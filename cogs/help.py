@@ -108,7 +108,14 @@ class Help(commands.Cog):
         if command_name:
             command = self.bot.get_command(command_name)
             if not command:
-                return await ctx.warning(f"Command `{command_name}` not found")
+                # the closest name by edit distance first, short typos share too few trigrams for search alone
+                best = self.bot.command_index.suggest(command_name)
+                suggestions = ([best] if best else []) + [cmd for cmd, _ in self.bot.command_index.search(command_name) if cmd is not best]
+                if not suggestions:
+                    return await ctx.warning(f"Command `{command_name}` not found")
+
+                names = ", ".join(f"`{cmd.qualified_name}`" for cmd in suggestions[:3])
+                return await ctx.warning(f"Command `{command_name}` not found, did you mean {names}?")
             
             return await self.send_command_help(ctx, command)
         
@@ -0,0 +1,99 @@
+import discord
+from discord.ext import commands
+from typing import List, Optional, Tuple
+
+from bot.levels import progress, required
+from bot.pages import RangePageSource, fit
+
+class Levels(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.color = 0xFFFFFF
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if self.bot.db: await self.bot.levels.handle(message)
+
+    @commands.command(
+        name="rank",
+        description="Show a member's level and rank",
+        usage="[member]",
+        brief="none"
+    )
+    async def rank(self, ctx, member: Optional[discord.Member] = None):
+        """Show a member's level and rank"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        member = member or ctx.author
+        total = await self.bot.levels.total(ctx.guild.id, member.id, cache=False)
+        if not total:
+            return await ctx.warning(f"{member.mention} has no XP yet")
+
+        level, exp = progress(total)
+        rank = await self.bot.leaderboards.rank(ctx.guild.id, member.id) if self.bot.redis else None
+
+        embed = discord.Embed(color=self.color)
+        embed.set_author(name=member.name, icon_url=member.display_avatar.url)
+        embed.add_field(name="level", value=f"{level}")
+        embed.add_field(name="xp", value=f"{exp}/{required(level)}")
+        embed.add_field(name="rank", value=f"#{rank}" if rank else "unranked")
+        await ctx.reply(embed=embed)
+
+    @commands.command(
+        name="leaderboard",
+        aliases=["lb"],
+        description="Show the members with the most XP",
+        brief="none"
+    )
+    async def leaderboard(self, ctx):
+        """Show the members with the most XP"""
+        if not self.bot.redis:
+            return await ctx.warning("Redis not available")
+
+        total = await self.bot.leaderboards.count(ctx.guild.id)
+        if not total:
+            return await ctx.warning("Nobody has XP in this server yet")
+
+        async def fetch(start: int, limit: int) -> List[Tuple[int, int]]:
+            return await self.bot.leaderboards.range(ctx.guild.id, start, limit)
+
+        def render(entries: List[Tuple[int, int]], offset: int) -> discord.Embed:
+            return discord.Embed(
+                title=f"Leaderboard for {ctx.guild.name}",
+                description=fit([f"`{offset + i}.` <@{member_id}> - level **{progress(xp)[0]}** ({xp} xp)" for i, (member_id, xp) in enumerate(entries, 1)]),
+                color=self.color
+            )
+
+        await ctx.paginator(RangePageSource(fetch, total, 10, render))
+
+    @commands.group(
+        name="levels",
+        description="Level system commands",
+        invoke_without_command=True
+    )
+    async def levels(self, ctx):
+        """Level system commands"""
+        await ctx.send_help(ctx.command)
+
+    @levels.command(
+        name="rebuild",
+        description="Rebuild the leaderboard from the database",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    @commands.cooldown(1, 300, commands.BucketType.guild)
+    async def levels_rebuild(self, ctx):
+        """Rebuild the leaderboard from the database"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+        if not self.bot.redis:
+            return await ctx.warning("Redis not available")
+
+        # write pending XP first, it would otherwise be missing from the rebuilt set
+        await self.bot.levels.flush()
+        members = await self.bot.leaderboards.rebuild(ctx.guild.id)
+        await ctx.success(f"Rebuilt the leaderboard with **{members}** members")
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Levels(bot))
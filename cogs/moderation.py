@@ -5,6 +5,9 @@ import asyncio
 from datetime import datetime, timedelta
 import re
 
+from bot.pages import KeysetPageSource, fit
+from bot.templates import moderation
+
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -22,6 +25,35 @@ class Moderation(commands.Cog):
         )
         return case_id
     
+    async def template(self, ctx, table: str) -> Optional[str]:
+        """The guild's ``invoke`` or ``dm`` template for the command being run, if it set one"""
+        if not self.bot.db:
+            return None
+        
+        config = await self.bot.guild_config.get(ctx.guild.id)
+        return next((row["embed"] for row in getattr(config, table) if row["command"] == ctx.command.name and row["embed"]), None)
+    
+    async def notify(self, ctx, member: Union[discord.Member, discord.User], reason: str, default: Optional[str] = None):
+        """DM the member about the action, with the guild's dm template when it has one"""
+        template = await self.template(ctx, "dm")
+        if not template and not default:
+            return
+        
+        try:
+            if template:
+                await member.send(**self.bot.templates.render(member, template, moderation(ctx.author, reason), guild=ctx.guild))
+            else:
+                await member.send(default)
+        except discord.HTTPException:
+            pass
+    
+    async def invoked(self, ctx, member: Union[discord.Member, discord.User], reason: str, default: str):
+        """Confirm the action, with the guild's invoke template when it has one"""
+        template = await self.template(ctx, "invoke")
+        if template:
+            return await ctx.send(**self.bot.templates.render(member, template, moderation(ctx.author, reason), guild=ctx.guild))
+        return await ctx.success(default)
+    
     @commands.command(
         name="cleanup",
         description="Clean up bot messages",
@@ -334,14 +366,11 @@ class Moderation(commands.Cog):
         if member.top_role >= ctx.guild.me.top_role:
             return await ctx.warning("I cannot kick this member")
         
-        try:
-            await member.send(f"You were kicked from **{ctx.guild.name}** by {ctx.author} for: {reason}")
-        except:
-            pass
+        await self.notify(ctx, member, reason, f"You were kicked from **{ctx.guild.name}** by {ctx.author} for: {reason}")
         
         await member.kick(reason=f"{ctx.author}: {reason}")
         await self.create_case(ctx.guild.id, member.id, ctx.author.id, "kick", reason)
-        await ctx.success(f"Kicked {member.mention} for: {reason}")
+        await self.invoked(ctx, member, reason, f"Kicked {member.mention} for: {reason}")
     
     @commands.command(
         name="ban",
@@ -359,14 +388,11 @@ class Moderation(commands.Cog):
             if member.top_role >= ctx.guild.me.top_role:
                 return await ctx.warning("I cannot ban this member")
             
-            try:
-                await member.send(f"You were banned from **{ctx.guild.name}** by {ctx.author} for: {reason}")
-            except:
-                pass
+            await self.notify(ctx, member, reason, f"You were banned from **{ctx.guild.name}** by {ctx.author} for: {reason}")
         
         await ctx.guild.ban(member, reason=f"{ctx.author}: {reason}")
         await self.create_case(ctx.guild.id, member.id, ctx.author.id, "ban", reason)
-        await ctx.success(f"Banned {member.mention} for: {reason}")
+        await self.invoked(ctx, member, reason, f"Banned {member.mention} for: {reason}")
     
     @commands.command(
         name="softban",
@@ -386,7 +412,7 @@ class Moderation(commands.Cog):
         await ctx.guild.ban(member, reason=f"{ctx.author}: {reason}", delete_message_days=7)
         await ctx.guild.unban(member, reason="Softban")
         await self.create_case(ctx.guild.id, member.id, ctx.author.id, "softban", reason)
-        await ctx.success(f"Softbanned {member.mention} for: {reason}")
+        await self.invoked(ctx, member, reason, f"Softbanned {member.mention} for: {reason}")
     
     @commands.command(
         name="hardban",
@@ -407,9 +433,10 @@ class Moderation(commands.Cog):
             "INSERT INTO hardban (guild_id, user_id, moderator_id, reason) VALUES ($1, $2, $3, $4)",
             ctx.guild.id, user_id, ctx.author.id, reason
         )
+        self.bot.joins.hardban(ctx.guild.id, user_id)
         
         await self.create_case(ctx.guild.id, user_id, ctx.author.id, "hardban", reason)
-        await ctx.success(f"Hardbanned user {user.mention} for: {reason}")
+        await self.invoked(ctx, user, reason, f"Hardbanned user {user.mention} for: {reason}")
     
     @commands.command(
         name="hardbanlist",
@@ -423,25 +450,29 @@ class Moderation(commands.Cog):
         if not self.bot.db:
             return await ctx.warning("Database not available")
         
-        hardbans = await self.bot.db.fetch(
-            "SELECT user_id, reason FROM hardban WHERE guild_id = $1",
-            ctx.guild.id
-        )
+        async def fetch(cursor, limit):
+            if cursor is None:
+                return await self.bot.db.fetch(
+                    "SELECT id, user_id, reason, timestamp FROM hardban WHERE guild_id = $1 ORDER BY timestamp DESC, id DESC LIMIT $2",
+                    ctx.guild.id, limit
+                )
+            return await self.bot.db.fetch(
+                "SELECT id, user_id, reason, timestamp FROM hardban WHERE guild_id = $1 AND (timestamp, id) < ($2, $3) ORDER BY timestamp DESC, id DESC LIMIT $4",
+                ctx.guild.id, *cursor, limit
+            )
         
-        if not hardbans:
-            return await ctx.warning("No hardbanned users")
+        def render(hardbans, offset):
+            return discord.Embed(
+                title="Hardbanned Users",
+                description=fit([f"<@{hb['user_id']}> (`{hb['user_id']}`) - {hb['reason']}" for hb in hardbans]),
+                color=self.color
+            )
         
-        description = []
-        for hb in hardbans[:10]:
-            user = await self.bot.fetch_user(hb['user_id'])
-            description.append(f"{user.mention} - {hb['reason']}")
+        source = KeysetPageSource(fetch, lambda hb: (hb['timestamp'], hb['id']), 10, render)
+        if await source.get_page(0) is None:
+            return await ctx.warning("No hardbanned users")
         
-        embed = discord.Embed(
-            title="Hardbanned Users",
-            description="\n".join(description),
-            color=self.color
-        )
-        await ctx.send(embed=embed)
+        await ctx.paginator(source)
     
     @commands.command(
         name="massban",
@@ -480,17 +511,13 @@ class Moderation(commands.Cog):
     async def unban(self, ctx, user_id: int, *, reason: str = "No reason provided"):
         """Unban a user from the server"""
         if self.bot.db:
-            hardban = await self.bot.db.fetchrow(
-                "SELECT * FROM hardban WHERE guild_id = $1 AND user_id = $2",
-                ctx.guild.id, user_id
-            )
-            if hardban:
+            if await self.bot.repo.hardbans.exists(ctx.guild.id, user_id):
                 return await ctx.warning("This user is hardbanned and cannot be unbanned")
         
         user = await self.bot.fetch_user(user_id)
         await ctx.guild.unban(user, reason=f"{ctx.author}: {reason}")
         await self.create_case(ctx.guild.id, user_id, ctx.author.id, "unban", reason)
-        await ctx.success(f"Unbanned {user.mention} for: {reason}")
+        await self.invoked(ctx, user, reason, f"Unbanned {user.mention} for: {reason}")
     
     @commands.command(
         name="nickname",
@@ -553,7 +580,8 @@ class Moderation(commands.Cog):
         until = discord.utils.utcnow() + timedelta(seconds=seconds)
         await member.timeout(until, reason=f"{ctx.author}: {reason}")
         await self.create_case(ctx.guild.id, member.id, ctx.author.id, "timeout", f"{duration} - {reason}")
-        await ctx.success(f"Timed out {member.mention} for **{duration}** - {reason}")
+        await self.notify(ctx, member, reason)
+        await self.invoked(ctx, member, reason, f"Timed out {member.mention} for **{duration}** - {reason}")
     
     @commands.command(
         name="untimeout",
@@ -587,19 +615,15 @@ class Moderation(commands.Cog):
             ctx.guild.id, member.id, ctx.author.id, reason, datetime.now()
         )
         
-        warns = await self.bot.db.fetch(
-            "SELECT * FROM warns WHERE guild_id = $1 AND user_id = $2",
+        total = await self.bot.db.fetchval(
+            "SELECT COUNT(*) FROM warns WHERE guild_id = $1 AND user_id = $2",
             ctx.guild.id, member.id
         )
         
         await self.create_case(ctx.guild.id, member.id, ctx.author.id, "warn", reason)
         
-        try:
-            await member.send(f"You were warned in **{ctx.guild.name}** by {ctx.author} for: {reason}")
-        except:
-            pass
-        
-        await ctx.success(f"Warned {member.mention} for: {reason} (Total warnings: {len(warns)})")
+        await self.notify(ctx, member, reason, f"You were warned in **{ctx.guild.name}** by {ctx.author} for: {reason}")
+        await self.invoked(ctx, member, reason, f"Warned {member.mention} for: {reason} (Total warnings: {total})")
     
     @commands.command(
         name="warnings",
@@ -614,27 +638,43 @@ class Moderation(commands.Cog):
         
         member = member or ctx.author
         
-        warns = await self.bot.db.fetch(
-            "SELECT * FROM warns WHERE guild_id = $1 AND user_id = $2 ORDER BY timestamp DESC",
+        async def fetch(cursor, limit):
+            if cursor is None:
+                return await self.bot.db.fetch(
+                    "SELECT id, moderator_id, reason, timestamp FROM warns WHERE guild_id = $1 AND user_id = $2 ORDER BY timestamp DESC, id DESC LIMIT $3",
+                    ctx.guild.id, member.id, limit
+                )
+            return await self.bot.db.fetch(
+                "SELECT id, moderator_id, reason, timestamp FROM warns WHERE guild_id = $1 AND user_id = $2 AND (timestamp, id) < ($3, $4) ORDER BY timestamp DESC, id DESC LIMIT $5",
+                ctx.guild.id, member.id, *cursor, limit
+            )
+        
+        def render(warns, offset):
+            description = []
+            for i, warn in enumerate(warns, offset + 1):
+                mod = ctx.guild.get_member(warn['moderator_id'])
+                mod_name = mod.mention if mod else f"<@{warn['moderator_id']}>"
+                description.append(f"**{i}.** {warn['reason']} - by {mod_name}")
+            
+            embed = discord.Embed(
+                title=f"Warnings for {member}",
+                description=fit(description),
+                color=self.color
+            )
+            embed.set_footer(text=f"Total warnings: {total}")
+            return embed
+        
+        # counted on the (guild_id, user_id) prefix of warns_guild_user_timestamp
+        total = await self.bot.db.fetchval(
+            "SELECT COUNT(*) FROM warns WHERE guild_id = $1 AND user_id = $2",
             ctx.guild.id, member.id
         )
-        
-        if not warns:
+        if not total:
             return await ctx.warning(f"{member.mention} has no warnings")
         
-        description = []
-        for i, warn in enumerate(warns[:10], 1):
-            mod = ctx.guild.get_member(warn['moderator_id'])
-            mod_name = mod.mention if mod else f"<@{warn['moderator_id']}>"
-            description.append(f"**{i}.** {warn['reason']} - by {mod_name}")
+        source = KeysetPageSource(fetch, lambda warn: (warn['timestamp'], warn['id']), 10, render)
         
-        embed = discord.Embed(
-            title=f"Warnings for {member}",
-            description="\n".join(description),
-            color=self.color
-        )
-        embed.set_footer(text=f"Total warnings: {len(warns)}")
-        await ctx.send(embed=embed)
+        await ctx.paginator(source)
     
     @commands.command(
         name="strip",
@@ -878,27 +918,36 @@ class Moderation(commands.Cog):
         
         member = member or ctx.author
         
-        cases = await self.bot.db.fetch(
-            "SELECT * FROM cases WHERE guild_id = $1 AND user_id = $2 ORDER BY timestamp DESC LIMIT 10",
-            ctx.guild.id, member.id
-        )
+        async def fetch(cursor, limit):
+            if cursor is None:
+                return await self.bot.db.fetch(
+                    "SELECT case_id, moderator_id, action, reason, timestamp FROM cases WHERE guild_id = $1 AND user_id = $2 ORDER BY timestamp DESC, case_id DESC LIMIT $3",
+                    ctx.guild.id, member.id, limit
+                )
+            return await self.bot.db.fetch(
+                "SELECT case_id, moderator_id, action, reason, timestamp FROM cases WHERE guild_id = $1 AND user_id = $2 AND (timestamp, case_id) < ($3, $4) ORDER BY timestamp DESC, case_id DESC LIMIT $5",
+                ctx.guild.id, member.id, *cursor, limit
+            )
         
-        if not cases:
-            return await ctx.warning(f"{member.mention} has no moderation history")
+        def render(cases, offset):
+            description = []
+            for case in cases:
+                mod = ctx.guild.get_member(case['moderator_id'])
+                mod_name = mod.mention if mod else f"<@{case['moderator_id']}>"
+                timestamp = f"<t:{int(case['timestamp'].timestamp())}:R>"
+                description.append(f"**Case #{case['case_id']}** - {case['action']} by {mod_name} {timestamp}\n{case['reason']}")
+            
+            return discord.Embed(
+                title=f"Moderation History for {member}",
+                description=fit(description, separator="\n\n"),
+                color=self.color
+            )
         
-        description = []
-        for case in cases:
-            mod = ctx.guild.get_member(case['moderator_id'])
-            mod_name = mod.mention if mod else f"<@{case['moderator_id']}>"
-            timestamp = f"<t:{int(case['timestamp'].timestamp())}:R>"
-            description.append(f"**Case #{case['case_id']}** - {case['action']} by {mod_name} {timestamp}\n{case['reason']}")
+        source = KeysetPageSource(fetch, lambda case: (case['timestamp'], case['case_id']), 10, render)
+        if await source.get_page(0) is None:
+            return await ctx.warning(f"{member.mention} has no moderation history")
         
-        embed = discord.Embed(
-            title=f"Moderation History for {member}",
-            description="\n\n".join(description),
-            color=self.color
-        )
-        await ctx.send(embed=embed)
+        await ctx.paginator(source)
     
     @commands.command(
         name="picperms",
@@ -972,10 +1021,8 @@ class Moderation(commands.Cog):
         if not self.bot.db:
             return await ctx.warning("Database not available")
         
-        await self.bot.db.execute(
-            "INSERT INTO prefixes (guild_id, prefix) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET prefix = $2",
-            ctx.guild.id, prefix
-        )
+        await self.bot.repo.prefixes.set(ctx.guild.id, prefix)
+        await self.bot.guild_config.invalidate(ctx.guild.id)
         await ctx.success(f"Server prefix set to `{prefix}`")
     
     @commands.command(
@@ -1007,6 +1054,7 @@ class Moderation(commands.Cog):
                 ctx.guild.id, member.id
             )
             await ctx.success(f"Protected {member.mention} from moderation")
+        await self.bot.guild_config.invalidate(ctx.guild.id)
 
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
@@ -0,0 +1,67 @@
+import discord
+from discord.ext import commands
+
+from bot.profiler import ProfiledPool
+
+class Owner(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.color = 0xFFFFFF
+
+    @commands.command(
+        name="error",
+        description="Look up an error by its code",
+        usage="<code>",
+        brief="bot owner",
+        hidden=True
+    )
+    @commands.is_owner()
+    async def error(self, ctx, code: str):
+        """Look up an error by its code"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        error = await self.bot.errors.lookup(code)
+        if not error:
+            return await ctx.warning(f"No error found with the code `{code}`")
+
+        embed = discord.Embed(
+            color=self.color,
+            title=f"Error {error['code']}",
+            description=f"```py\n{error['error'][-4000:]}```"
+        )
+        embed.add_field(name="command", value=error['command'] or "none")
+        embed.add_field(name="guild", value=f"`{error['guild_id']}`" if error['guild_id'] else "none")
+        embed.add_field(name="user", value=f"<@{error['user_id']}>" if error['user_id'] else "none")
+        embed.add_field(name="time", value=f"<t:{error['time']}:R>")
+        await ctx.reply(embed=embed)
+
+    @commands.command(
+        name="queries",
+        description="Show the statements taking the most database time",
+        usage="[limit] [total/calls/max/wait/rows]",
+        brief="bot owner",
+        hidden=True
+    )
+    @commands.is_owner()
+    async def queries(self, ctx, limit: int = 10, sort: str = "total"):
+        """Show the statements taking the most database time"""
+        if not isinstance(self.bot.db, ProfiledPool):
+            return await ctx.warning("Query profiling is disabled, set `DB_PROFILE` to enable it")
+        
+        if sort not in ("total", "calls", "max", "wait", "rows"):
+            return await ctx.warning("You can only sort by **total**, **calls**, **max**, **wait** or **rows**")
+        
+        top = self.bot.db.top(limit, sort)
+        if not top:
+            return await ctx.warning("No queries recorded yet")
+        
+        entries = [
+            f"**{stats.total * 1000:.0f}ms** total, {stats.calls} calls, {stats.total / stats.calls * 1000:.2f}ms avg, "
+            f"{stats.max * 1000:.0f}ms max, {stats.wait * 1000:.0f}ms waiting, {stats.rows} rows\n```sql\n{query[:300]}```"
+            for query, stats in top
+        ]
+        await ctx.paginator(ctx.page_source(entries, "Queries", {'name': ctx.author.name, 'icon_url': ctx.author.display_avatar.url}, numbered=True, per_page=5))
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Owner(bot))
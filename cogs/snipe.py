@@ -0,0 +1,135 @@
+import discord
+from discord.ext import commands
+from typing import Dict, List
+from datetime import datetime, timezone
+
+from bot.snipe import DELETE, EDIT, REACTION
+
+class Snipe(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.color = 0xFFFFFF
+
+    def deleted(self, message: discord.Message) -> dict:
+        return {
+            "author": str(message.author),
+            "avatar": message.author.display_avatar.url,
+            "content": message.content[:2000],
+            "attachment": message.attachments[0].proxy_url if message.attachments else None,
+        }
+
+    @commands.Cog.listener()
+    async def on_message_delete(self, message: discord.Message):
+        if not message.guild or message.author.bot: return
+        await self.bot.snipes.push(DELETE, message.channel.id, [self.deleted(message)])
+
+    @commands.Cog.listener()
+    async def on_bulk_message_delete(self, messages: List[discord.Message]):
+        channels: Dict[int, List[dict]] = {}
+        # oldest first, so the newest message ends up on top of the buffer
+        for message in sorted(messages, key=lambda message: message.id):
+            if message.guild and not message.author.bot: channels.setdefault(message.channel.id, []).append(self.deleted(message))
+        for channel_id, entries in channels.items(): await self.bot.snipes.push(DELETE, channel_id, entries)
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        if not before.guild or before.author.bot or before.content == after.content: return
+        await self.bot.snipes.push(EDIT, before.channel.id, [{
+            "author": str(before.author),
+            "avatar": before.author.display_avatar.url,
+            "before": before.content[:1000],
+            "after": after.content[:1000],
+        }])
+
+    @commands.Cog.listener()
+    async def on_reaction_remove(self, reaction: discord.Reaction, user: discord.User):
+        if not reaction.message.guild or user.bot: return
+        emoji = reaction.emoji
+        await self.bot.snipes.push(REACTION, reaction.message.channel.id, [{
+            "author": str(user),
+            "avatar": user.display_avatar.url,
+            "emoji": str(emoji),
+            "emoji_url": emoji.url if isinstance(emoji, (discord.Emoji, discord.PartialEmoji)) and emoji.is_custom_emoji() else None,
+            "message": reaction.message.jump_url,
+        }])
+
+    async def entry(self, ctx, kind: str, index: int, what: str):
+        entries = await self.bot.snipes.get(kind, ctx.channel.id)
+        if not entries:
+            await ctx.warning(f"No {what} found in this channel")
+            return None, 0
+        if index < 1 or index > len(entries):
+            await ctx.warning(f"There are only **{len(entries)}** {what} to snipe")
+            return None, 0
+        return entries[index - 1], len(entries)
+
+    @commands.command(
+        name="snipe",
+        aliases=["s"],
+        description="Show a recently deleted message",
+        usage="[index]",
+        brief="none"
+    )
+    async def snipe(self, ctx, index: int = 1):
+        """Show a recently deleted message"""
+        entry, total = await self.entry(ctx, DELETE, index, "deleted messages")
+        if not entry: return
+
+        embed = discord.Embed(color=self.color, description=entry['content'] or None)
+        embed.set_author(name=entry['author'], icon_url=entry['avatar'])
+        if entry['attachment']: embed.set_image(url=entry['attachment'])
+        embed.set_footer(text=f"{index}/{total}")
+        embed.timestamp = datetime.fromtimestamp(entry['time'], timezone.utc)
+        await ctx.reply(embed=embed)
+
+    @commands.command(
+        name="editsnipe",
+        aliases=["es"],
+        description="Show a recently edited message",
+        usage="[index]",
+        brief="none"
+    )
+    async def editsnipe(self, ctx, index: int = 1):
+        """Show a recently edited message"""
+        entry, total = await self.entry(ctx, EDIT, index, "edited messages")
+        if not entry: return
+
+        embed = discord.Embed(color=self.color)
+        embed.set_author(name=entry['author'], icon_url=entry['avatar'])
+        embed.add_field(name="before", value=entry['before'] or "none", inline=False)
+        embed.add_field(name="after", value=entry['after'] or "none", inline=False)
+        embed.set_footer(text=f"{index}/{total}")
+        await ctx.reply(embed=embed)
+
+    @commands.command(
+        name="reactionsnipe",
+        aliases=["rs"],
+        description="Show a recently removed reaction",
+        usage="[index]",
+        brief="none"
+    )
+    async def reactionsnipe(self, ctx, index: int = 1):
+        """Show a recently removed reaction"""
+        entry, total = await self.entry(ctx, REACTION, index, "removed reactions")
+        if not entry: return
+
+        embed = discord.Embed(color=self.color, description=f"**{entry['author']}** removed {entry['emoji']} from [this message]({entry['message']}) <t:{entry['time']}:R>")
+        embed.set_author(name=entry['author'], icon_url=entry['avatar'])
+        if entry['emoji_url']: embed.set_thumbnail(url=entry['emoji_url'])
+        embed.set_footer(text=f"{index}/{total}")
+        await ctx.reply(embed=embed)
+
+    @commands.command(
+        name="clearsnipe",
+        aliases=["cs"],
+        description="Clear the snipes of this channel",
+        brief="manage messages"
+    )
+    @commands.has_permissions(manage_messages=True)
+    async def clearsnipe(self, ctx):
+        """Clear the snipes of this channel"""
+        await self.bot.snipes.clear(ctx.channel.id)
+        await ctx.success("Cleared the snipes of this channel")
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Snipe(bot))
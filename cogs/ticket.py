@@ -1,14 +1,203 @@
 import discord
 from discord.ext import commands
 from discord.ui import View
+from typing import Optional
+
+from bot.transcripts import export
 
 class CreateTicket(View):
     def __init__(self):
         super().__init__(timeout=None)
 
+    @discord.ui.button(label="Create ticket", emoji="🎫", style=discord.ButtonStyle.gray, custom_id="ticket:create")
+    async def create(self, interaction: discord.Interaction, button: discord.ui.Button):
+        bot, guild = interaction.client, interaction.guild
+        if not bot.db:
+            return await interaction.response.send_message("Tickets are unavailable right now", ephemeral=True)
+
+        config = await bot.guild_config.get(guild.id)
+        settings = config.first("tickets")
+        if not settings:
+            return await interaction.response.send_message("Tickets are not set up in this server", ephemeral=True)
+
+        opened = await bot.db.fetchval("SELECT channel_id FROM opened_tickets WHERE guild_id = $1 AND user_id = $2", guild.id, interaction.user.id)
+        if opened and guild.get_channel(opened):
+            return await interaction.response.send_message(f"You already have a ticket open in <#{opened}>", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True, manage_channels=True, read_message_history=True),
+            interaction.user: discord.PermissionOverwrite(view_channel=True, send_messages=True, attach_files=True, read_message_history=True),
+        }
+        for role in (guild.get_role(row["role_id"] or 0) for row in config.ticket_support):
+            if role: overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True)
+
+        category = guild.get_channel(settings["category"] or 0)
+        try:
+            channel = await guild.create_text_channel(f"ticket-{interaction.user.name}"[:100], category=category if isinstance(category, discord.CategoryChannel) else None, overwrites=overwrites, reason=f"Ticket opened by {interaction.user}")
+        except discord.HTTPException:
+            return await interaction.followup.send("I could not create your ticket", ephemeral=True)
+
+        await bot.db.execute("INSERT INTO opened_tickets (guild_id, channel_id, user_id) VALUES ($1, $2, $3)", guild.id, channel.id, interaction.user.id)
+        embed = discord.Embed(color=settings["color"] or bot.color, description=f"{interaction.user.mention} support will be with you shortly")
+        await channel.send(interaction.user.mention, embed=embed, view=DeleteTicket())
+        await interaction.followup.send(f"Opened your ticket in {channel.mention}", ephemeral=True)
+
 class DeleteTicket(View):
     def __init__(self):
         super().__init__(timeout=None)
 
+    @discord.ui.button(label="Close", emoji="🗑️", style=discord.ButtonStyle.red, custom_id="ticket:close")
+    async def close(self, interaction: discord.Interaction, button: discord.ui.Button):
+        bot = interaction.client
+        if not bot.db:
+            return await interaction.response.send_message("Tickets are unavailable right now", ephemeral=True)
+
+        opener = await bot.db.fetchval("SELECT user_id FROM opened_tickets WHERE channel_id = $1", interaction.channel.id)
+        if opener is None:
+            return await interaction.response.send_message("This channel is not a ticket", ephemeral=True)
+
+        config = await bot.guild_config.get(interaction.guild.id)
+        support = {row["role_id"] for row in config.ticket_support}
+        if interaction.user.id != opener and not interaction.user.guild_permissions.manage_channels and not any(role.id in support for role in interaction.user.roles):
+            return await interaction.response.send_message("You cannot close this ticket", ephemeral=True)
+
+        await interaction.response.send_message("Closing this ticket...")
+        await close_ticket(bot, interaction.channel, interaction.user, opener)
+
+async def close_ticket(bot: commands.Bot, channel: discord.TextChannel, closer: discord.abc.User, opener: Optional[int] = None, format: str = "html"):
+    """Send the ticket's transcript to the logs channel, then delete the ticket.
+
+    The ticket is kept when the transcript cannot be delivered.
+    """
+    config = await bot.guild_config.get(channel.guild.id)
+    settings = config.first("tickets")
+    logs = channel.guild.get_channel(settings["logs"] or 0) if settings else None
+
+    if logs:
+        transcript = None
+        try:
+            transcript = await export(channel, format)
+            embed = discord.Embed(color=settings["color"] or bot.color, description=f"Ticket `#{channel.name}` opened by <@{opener}> was closed by {closer.mention}")
+            await logs.send(embed=embed, file=discord.File(transcript, filename=f"{channel.name}.{format}"))
+        except Exception as e:
+            print(f"Failed to deliver the transcript of {channel.id}: {e}")
+            try: await channel.send(f"{closer.mention} the transcript could not be sent to {logs.mention}, so this ticket was kept open")
+            except discord.HTTPException: pass
+            return
+        finally:
+            if transcript: transcript.close()
+
+    await bot.db.execute("DELETE FROM opened_tickets WHERE channel_id = $1", channel.id)
+    try: await channel.delete(reason=f"Ticket closed by {closer}")
+    except discord.HTTPException: pass
+
+class Ticket(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.color = 0xFFFFFF
+
+    async def settings(self, ctx, column: str, value) -> None:
+        if await self.bot.db.fetchval("SELECT EXISTS (SELECT 1 FROM tickets WHERE guild_id = $1)", ctx.guild.id):
+            await self.bot.db.execute(f"UPDATE tickets SET {column} = $2 WHERE guild_id = $1", ctx.guild.id, value)
+        else:
+            await self.bot.db.execute(f"INSERT INTO tickets (guild_id, {column}) VALUES ($1, $2)", ctx.guild.id, value)
+        await self.bot.guild_config.invalidate(ctx.guild.id)
+
+    @commands.group(
+        name="ticket",
+        description="Ticket commands",
+        invoke_without_command=True
+    )
+    async def ticket(self, ctx):
+        """Ticket commands"""
+        await ctx.send_help(ctx.command)
+
+    @ticket.command(
+        name="setup",
+        description="Send the ticket panel to a channel",
+        usage="[channel] [message]",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def ticket_setup(self, ctx, channel: discord.TextChannel = None, *, message: str = "Click the button below to open a ticket"):
+        """Send the ticket panel to a channel"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        channel = channel or ctx.channel
+        await channel.send(embed=discord.Embed(color=self.color, title="Tickets", description=message), view=CreateTicket())
+        await self.settings(ctx, "channel_id", channel.id)
+        await self.settings(ctx, "message", message)
+        await ctx.success(f"Sent the ticket panel to {channel.mention}")
+
+    @ticket.command(
+        name="logs",
+        description="Set the channel ticket transcripts are sent to",
+        usage="<channel>",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def ticket_logs(self, ctx, channel: discord.TextChannel):
+        """Set the channel ticket transcripts are sent to"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        await self.settings(ctx, "logs", channel.id)
+        await ctx.success(f"Ticket transcripts will be sent to {channel.mention}")
+
+    @ticket.command(
+        name="category",
+        description="Set the category tickets are opened in",
+        usage="<category>",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def ticket_category(self, ctx, *, category: discord.CategoryChannel):
+        """Set the category tickets are opened in"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        await self.settings(ctx, "category", category.id)
+        await ctx.success(f"Tickets will be opened in **{category.name}**")
+
+    @ticket.command(
+        name="support",
+        description="Add or remove a role that can see every ticket",
+        usage="<role>",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def ticket_support(self, ctx, *, role: discord.Role):
+        """Add or remove a role that can see every ticket"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        if await self.bot.db.execute("DELETE FROM ticket_support WHERE guild_id = $1 AND role_id = $2", ctx.guild.id, role.id) != "DELETE 0":
+            await ctx.success(f"{role.mention} is no longer a support role")
+        else:
+            await self.bot.db.execute("INSERT INTO ticket_support (guild_id, role_id) VALUES ($1, $2)", ctx.guild.id, role.id)
+            await ctx.success(f"{role.mention} is now a support role")
+        await self.bot.guild_config.invalidate(ctx.guild.id)
+
+    @ticket.command(
+        name="close",
+        description="Close the ticket in this channel",
+        brief="manage channels"
+    )
+    @commands.has_permissions(manage_channels=True)
+    async def ticket_close(self, ctx):
+        """Close the ticket in this channel"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        opener = await self.bot.db.fetchval("SELECT user_id FROM opened_tickets WHERE channel_id = $1", ctx.channel.id)
+        if opener is None:
+            return await ctx.warning("This channel is not a ticket")
+
+        await ctx.success("Closing this ticket...")
+        await close_ticket(self.bot, ctx.channel, ctx.author, opener)
+
 async def setup(bot: commands.Bot):
-    pass
+    await bot.add_cog(Ticket(bot))
@@ -3,8 +3,138 @@ from discord.ext import commands
 from discord.ui import View
 
 class vmbuttons(View):
+    """The interface panel, acting on the voice channel the clicking member is in."""
+
     def __init__(self):
         super().__init__(timeout=None)
 
+    async def owned(self, interaction: discord.Interaction, claiming: bool = False):
+        voicemaster = interaction.client.voicemaster
+        state = interaction.user.voice
+        channel = state.channel if state else None
+        if not channel or channel.id not in voicemaster.owners:
+            await interaction.response.send_message("You are not in a voicemaster channel", ephemeral=True)
+            return None
+
+        owner = voicemaster.owners[channel.id]
+        if claiming and owner == interaction.user.id:
+            await interaction.response.send_message("You already own this channel", ephemeral=True)
+            return None
+        if claiming and any(member.id == owner for member in channel.members):
+            await interaction.response.send_message("The owner is still in this channel", ephemeral=True)
+            return None
+        if not claiming and owner != interaction.user.id:
+            await interaction.response.send_message("You do not own this channel", ephemeral=True)
+            return None
+        return channel
+
+    async def overwrite(self, interaction: discord.Interaction, message: str, **permissions):
+        channel = await self.owned(interaction)
+        if not channel: return
+        # set_permissions replaces the whole overwrite, so lock and hide are kept by updating the current one
+        overwrite = channel.overwrites_for(interaction.guild.default_role)
+        overwrite.update(**permissions)
+        await channel.set_permissions(interaction.guild.default_role, overwrite=overwrite, reason=f"VoiceMaster: {interaction.user}")
+        await interaction.response.send_message(message, ephemeral=True)
+
+    @discord.ui.button(emoji="🔒", style=discord.ButtonStyle.gray, custom_id="vm:lock")
+    async def lock(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.overwrite(interaction, "Locked your channel", connect=False)
+
+    @discord.ui.button(emoji="🔓", style=discord.ButtonStyle.gray, custom_id="vm:unlock")
+    async def unlock(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.overwrite(interaction, "Unlocked your channel", connect=True)
+
+    @discord.ui.button(emoji="👻", style=discord.ButtonStyle.gray, custom_id="vm:hide")
+    async def hide(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.overwrite(interaction, "Hid your channel", view_channel=False)
+
+    @discord.ui.button(emoji="👁️", style=discord.ButtonStyle.gray, custom_id="vm:reveal")
+    async def reveal(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.overwrite(interaction, "Revealed your channel", view_channel=True)
+
+    @discord.ui.button(emoji="👑", style=discord.ButtonStyle.gray, custom_id="vm:claim")
+    async def claim(self, interaction: discord.Interaction, button: discord.ui.Button):
+        channel = await self.owned(interaction, claiming=True)
+        if not channel: return
+        await interaction.client.voicemaster.transfer(channel, interaction.user)
+        await interaction.response.send_message("You now own this channel", ephemeral=True)
+
+class VoiceMaster(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.color = 0xFFFFFF
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        if self.bot.db: await self.bot.voicemaster.handle(member, before, after)
+
+    @commands.group(
+        name="voicemaster",
+        aliases=["vm"],
+        description="VoiceMaster commands",
+        invoke_without_command=True
+    )
+    async def voicemaster(self, ctx):
+        """VoiceMaster commands"""
+        await ctx.send_help(ctx.command)
+
+    @voicemaster.command(
+        name="setup",
+        description="Create the join to create channel and its interface",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    @commands.bot_has_permissions(manage_channels=True, move_members=True)
+    async def voicemaster_setup(self, ctx):
+        """Create the join to create channel and its interface"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        if await self.bot.db.fetchrow("SELECT channel_id FROM voicemaster WHERE guild_id = $1", ctx.guild.id):
+            return await ctx.warning("VoiceMaster is already set up, use `voicemaster reset` first")
+
+        category = await ctx.guild.create_category("voice channels", reason=f"VoiceMaster setup by {ctx.author}")
+        interface = await category.create_text_channel("interface", overwrites={ctx.guild.default_role: discord.PermissionOverwrite(send_messages=False)})
+        join = await category.create_voice_channel("join to create")
+
+        embed = discord.Embed(color=self.color, title="VoiceMaster", description="Join the voice channel below to get your own, then manage it with these buttons")
+        embed.add_field(name="controls", value="🔒 lock\n🔓 unlock\n👻 hide\n👁️ reveal\n👑 claim")
+        await interface.send(embed=embed, view=vmbuttons())
+
+        await self.bot.db.execute("INSERT INTO voicemaster (guild_id, channel_id, interface) VALUES ($1, $2, $3)", ctx.guild.id, join.id, interface.id)
+        await self.bot.guild_config.invalidate(ctx.guild.id)
+        await self.bot.voicemaster.refill(ctx.guild, join)
+        await ctx.success(f"Set up VoiceMaster in {join.mention}")
+
+    @voicemaster.command(
+        name="reset",
+        description="Remove the join to create channel and its interface",
+        brief="manage guild"
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def voicemaster_reset(self, ctx):
+        """Remove the join to create channel and its interface"""
+        if not self.bot.db:
+            return await ctx.warning("Database not available")
+
+        row = await self.bot.db.fetchrow("SELECT channel_id, interface FROM voicemaster WHERE guild_id = $1", ctx.guild.id)
+        if not row:
+            return await ctx.warning("VoiceMaster is not set up")
+
+        join = ctx.guild.get_channel(row['channel_id'] or 0)
+        spares = [ctx.guild.get_channel(channel_id) for channel_id in self.bot.voicemaster.pools.pop(ctx.guild.id, ())]
+        for channel in [join, ctx.guild.get_channel(row['interface'] or 0), *spares]:
+            if channel:
+                try: await channel.delete(reason=f"VoiceMaster reset by {ctx.author}")
+                except discord.HTTPException: pass
+        if join and join.category and not join.category.channels:
+            try: await join.category.delete(reason=f"VoiceMaster reset by {ctx.author}")
+            except discord.HTTPException: pass
+
+        await self.bot.db.execute("DELETE FROM voicemaster WHERE guild_id = $1", ctx.guild.id)
+        await self.bot.guild_config.invalidate(ctx.guild.id)
+        await ctx.success("Removed VoiceMaster")
+
 async def setup(bot: commands.Bot):
-    pass
+    await bot.add_cog(VoiceMaster(bot))
@@ -0,0 +1,13 @@
+import discord
+from discord.ext import commands
+
+class Antinuke(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry):
+        if self.bot.db: await self.bot.antinuke.handle(entry)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Antinuke(bot))
@@ -0,0 +1,21 @@
+import discord
+from discord.ext import commands
+
+class Boards(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        if self.bot.db: await self.bot.boards.handle(payload, 1)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        if self.bot.db: await self.bot.boards.handle(payload, -1)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload: discord.RawReactionClearEvent):
+        if self.bot.db: await self.bot.boards.clear(payload)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Boards(bot))
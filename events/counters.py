@@ -0,0 +1,25 @@
+import discord
+from discord.ext import commands
+
+class Counters(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.bot.counters.mark(member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.bot.counters.mark(member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.premium_since != after.premium_since: self.bot.counters.mark(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
+        if before.premium_subscription_count != after.premium_subscription_count: self.bot.counters.mark(after.id)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Counters(bot))
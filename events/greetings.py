@@ -0,0 +1,28 @@
+import discord
+from discord.ext import commands
+
+class Greetings(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def send(self, member: discord.Member, table: str):
+        if not self.bot.db: return
+        config = await self.bot.guild_config.get(member.guild.id)
+        settings = config.first(table)
+        if not settings or not settings["mes"]: return
+
+        channel = member.guild.get_channel(settings["channel_id"] or 0)
+        if not channel: return
+        try: await channel.send(**self.bot.templates.render(member, settings["mes"]), allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False))
+        except discord.HTTPException: pass
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        await self.send(member, "leave")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if not before.premium_since and after.premium_since: await self.send(after, "boost")
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Greetings(bot))
@@ -0,0 +1,17 @@
+import discord
+from discord.ext import commands
+
+class Joins(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if self.bot.db: await self.bot.joins.handle(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        if self.bot.db: self.bot.joins.left(member)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Joins(bot))
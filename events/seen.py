@@ -0,0 +1,21 @@
+import discord
+from discord.ext import commands
+
+class Seen(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild and not message.author.bot: self.bot.seen.touch(message.guild.id, message.author.id)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        if before.status != after.status and not after.bot: self.bot.seen.touch(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        self.bot.seen.rename(before, after)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Seen(bot))
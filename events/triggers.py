@@ -0,0 +1,29 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+
+class Triggers(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if not message.guild or message.author.bot or not self.bot.db: return
+
+        matches = await self.bot.triggers.match(message.guild.id, message.content)
+        if not matches: return
+
+        if (matches.filtered or matches.invite) and not message.author.guild_permissions.manage_messages:
+            try: await message.delete()
+            except discord.HTTPException: pass
+            return
+
+        if matches.reactions:
+            await asyncio.gather(*(message.add_reaction(emoji) for emoji in matches.reactions), return_exceptions=True)
+        for response in matches.responses:
+            try: await message.channel.send(response, allowed_mentions=discord.AllowedMentions(everyone=False, roles=False))
+            except discord.HTTPException: pass
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Triggers(bot))
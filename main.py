@@ -22,13 +22,14 @@ async def main():
         traceback.print_exc()
     finally:
         if bot:
+            # close the bot first so buffered writes are flushed while the pool is still open
+            await bot.close()
             if bot.db:
                 await bot.db.close()
                 print("Database connection closed")
             if hasattr(bot, 'redis') and bot.redis:
                 await bot.redis.close()
                 print("Redis connection closed")
-            await bot.close()
             print("Bot shut down successfully")
 
 if __name__ == "__main__":
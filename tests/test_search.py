@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from discord.ext import commands
+
+from bot.search import CommandIndex, distance
+
+async def noop(ctx):
+    pass
+
+NAMES = ["help", "kick", "ban", "warn", "warnings", "unban", "hardban", "snipe", "giveaway", "leaderboard"]
+
+@pytest.fixture
+def index():
+    registered = [commands.Command(noop, name=name, description=f"{name} command") for name in NAMES]
+    return CommandIndex(SimpleNamespace(walk_commands=lambda: iter(registered)))
+
+def test_distance_counts_a_transposition_as_one_edit():
+    assert distance("hlep", "help") == 1
+    assert distance("kcik", "kick") == 1
+    assert distance("warn", "warnings") == 4
+
+@pytest.mark.parametrize("typo, name", [
+    ("hlep", "help"),
+    ("kcik", "kick"),
+    ("bna", "ban"),
+    ("wanr", "warn"),
+    ("unbna", "unban"),
+    ("sinpe", "snipe"),
+    ("giveawya", "giveaway"),
+    ("leaderbaord", "leaderboard"),
+    ("kik", "kick"),
+    ("hardbam", "hardban"),
+])
+def test_suggest_single_edit_typos(index, typo, name):
+    assert index.suggest(typo).name == name
+
+def test_suggest_nothing_for_unrelated_words(index):
+    assert index.suggest("zzzz") is None
+
+@pytest.mark.parametrize("typo, name", [("hlep", "help"), ("kcik", "kick"), ("bna", "ban"), ("sinpe", "snipe")])
+def test_help_suggests_single_edit_typos(index, typo, name):
+    import bot  # noqa: F401, loads the package before the cog to avoid a circular import
+    from cogs.help import Help
+
+    warnings = []
+    async def warning(message): warnings.append(message)
+    cog = Help(SimpleNamespace(get_command=lambda name: None, command_index=index))
+
+    asyncio.run(Help.help_command.callback(cog, SimpleNamespace(warning=warning), command_name=typo))
+    assert warnings[0].startswith(f"Command `{typo}` not found, did you mean `{name}`")
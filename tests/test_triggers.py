@@ -0,0 +1,26 @@
+import pytest
+
+from bot.guildconfig import GuildConfig
+from bot.triggers import Automaton, GuildTriggers
+
+@pytest.fixture
+def triggers():
+    return GuildTriggers(GuildConfig(1, {
+        "chatfilter": [{"word": "ass"}],
+        "autoreact": [{"trigger": "lol!", "emojis": "😂"}],
+        "autoresponses": [{"key": "hi", "response": "hello"}],
+    }))
+
+@pytest.mark.parametrize("content", ["I am in class", "this is his thing", "sassy", "hiking"])
+def test_patterns_inside_words_do_not_match(triggers, content):
+    assert not triggers.match(content)
+
+def test_patterns_match_on_word_boundaries(triggers):
+    matches = triggers.match("Hi, what an ASS. lol!!")
+    assert matches.filtered == ["ass"]
+    assert matches.responses == ["hello"]
+    assert matches.reactions == ["😂"]
+
+def test_overlapping_patterns_are_checked_separately():
+    automaton = Automaton([("his", "his"), ("hi", "hi"), ("is", "is")])
+    assert [automaton.values[i] for i in automaton.search("this is his")] == ["his", "is"]